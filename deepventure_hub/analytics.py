@@ -0,0 +1,219 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+
+class AnalyticsSnapshot(namedtuple("AnalyticsSnapshot", ["data", "computed_at"])):
+    """A published result; `data` is read-only and shared by every reader"""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        """Plain (JSON-serializable) copy of `data` that the caller may modify"""
+        return _thaw(self.data)
+
+
+# A review counts toward a category when it contains any of its keywords
+CATEGORY_KEYWORDS = {
+    "restaurant": ("restaurant", "food", "menu", "dinner", "lunch", "chef"),
+    "tech": ("tech", "app", "online", "website", "software", "computer"),
+    "service": ("service", "staff", "appointment", "repair", "cleaning", "customer"),
+}
+# Review length histogram edges in bytes; percentiles are read off this
+LENGTH_BINS = np.array([0, 100, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, np.inf])
+
+
+class _CategoryStats:
+    """Mergeable sufficient statistics for one category"""
+
+    def __init__(self):
+        self.star_counts = np.zeros(5, dtype=np.int64)
+        self.length_counts = np.zeros(len(LENGTH_BINS) - 1, dtype=np.int64)
+        self.length_sum = 0
+        self.length_sq_sum = 0
+
+    def add(self, stars, lengths):
+        self.star_counts += np.bincount(stars, minlength=6)[1:6]
+        self.length_counts += np.histogram(lengths, LENGTH_BINS)[0]
+        lengths = lengths.astype(np.float64)
+        self.length_sum += float(lengths.sum())
+        self.length_sq_sum += float((lengths * lengths).sum())
+
+    def summary(self):
+        count = int(self.star_counts.sum())
+        if not count:
+            return {"count": 0, "mean_stars": None, "star_distribution": [0] * 5, "text_length": None}
+        mean_length = self.length_sum / count
+        cumulative = np.cumsum(self.length_counts)
+        return {
+            "count": count,
+            "mean_stars": round(float(self.star_counts @ np.arange(1, 6)) / count, 4),
+            "star_distribution": [int(c) for c in self.star_counts],
+            "text_length": {
+                "mean": round(mean_length, 1),
+                "std": round(max(self.length_sq_sum / count - mean_length ** 2, 0.0) ** 0.5, 1),
+                # Upper edge of the bucket holding the median / 90th percentile
+                "p50_upper": float(LENGTH_BINS[np.searchsorted(cumulative, 0.5 * count) + 1]),
+                "p90_upper": float(LENGTH_BINS[np.searchsorted(cumulative, 0.9 * count) + 1]),
+            },
+        }
+
+
+class CorpusAggregator:
+    """Per-category star and review-length statistics over a whole LocalReviewIndex.
+
+    Category membership is the union of the keywords' posting lists, marked
+    into a boolean row mask, and star/length columns are reduced with
+    bincount and histogram, so one pass over ~650k reviews takes
+    milliseconds. Statistics are mergeable: `update(index)` only scans rows
+    beyond those already counted, and `ingest(rows)` folds in new
+    datasets-server style rows. `summary()` is cached until either changes.
+    """
+
+    def __init__(self, keywords=CATEGORY_KEYWORDS):
+        self.keywords = {category: tuple(words) for category, words in keywords.items()}
+        self.stats = {category: _CategoryStats() for category in self.keywords}
+        self.total = _CategoryStats()
+        self.rows_seen = 0  # index rows already aggregated
+        self._summary = None
+        self._lock = threading.Lock()
+
+    def update(self, index):
+        """Aggregate index rows not yet counted; returns how many were added"""
+        with self._lock:
+            start, stop = self.rows_seen, len(index)
+            if stop <= start:
+                return 0
+            stars = np.asarray(index.stars[start:stop])
+            offsets = np.asarray(index.text_offsets[start:stop + 1])
+            lengths = np.diff(offsets)
+            self.total.add(stars, lengths)
+            mask = np.zeros(stop - start, dtype=bool)
+            for category, words in self.keywords.items():
+                mask[:] = False
+                for word in words:
+                    postings = index.term_postings(word)
+                    # Posting lists are sorted by row id, so new rows are a suffix
+                    postings = postings[np.searchsorted(postings, start):np.searchsorted(postings, stop)]
+                    mask[np.asarray(postings) - start] = True
+                self.stats[category].add(stars[mask], lengths[mask])
+            self.rows_seen = stop
+            self._summary = None
+            return stop - start
+
+    def ingest(self, rows):
+        """Fold in new {"row": {"stars", "text"}} rows that are not part of the index"""
+        from local_reviews import tokenize
+
+        rows = list(rows)
+        if not rows:
+            return 0
+        stars = np.array([row["row"]["stars"] for row in rows], dtype=np.int64)
+        texts = [row["row"]["text"] for row in rows]
+        lengths = np.array([len(text.encode("utf-8")) for text in texts], dtype=np.int64)
+        tokens = [set(tokenize(text)) for text in texts]
+        with self._lock:
+            self.total.add(stars, lengths)
+            for category, words in self.keywords.items():
+                mask = np.array([not row_tokens.isdisjoint(words) for row_tokens in tokens])
+                self.stats[category].add(stars[mask], lengths[mask])
+            self._summary = None
+        return len(rows)
+
+    def summary(self):
+        """{"corpus": stats, "categories": {category: stats}}, cached until the next update"""
+        with self._lock:
+            if self._summary is None:
+                self._summary = {
+                    "corpus": self.total.summary(),
+                    "categories": {category: stats.summary() for category, stats in self.stats.items()},
+                }
+            return self._summary
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+class AnalyticsRefresher:
+    """Recomputes analytics on an interval and publishes immutable snapshots.
+
+    Readers get the latest snapshot in constant time, so upstream load depends
+    on `interval` rather than on the number of viewers. Until `start()` is
+    called, a snapshot older than `interval` is recomputed on the next read.
+    """
+
+    def __init__(self, compute, interval=60):
+        self.compute = compute
+        self.interval = interval
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_now()
+            except Exception as exc:  # keep serving the previous snapshot
+                self.last_error = exc
+            self._stop.wait(self.interval)
+
+    def refresh_now(self):
+        """Recompute and publish a new snapshot; concurrent callers share one computation"""
+        started = time.time()
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.computed_at >= started:
+                return snapshot
+            snapshot = AnalyticsSnapshot(_freeze(self.compute()), time.time())
+            self._snapshot = snapshot
+            return snapshot
+
+    def publish(self, data):
+        """Publish analytics computed elsewhere (e.g. by an async caller) as the latest snapshot"""
+        snapshot = AnalyticsSnapshot(_freeze(data), time.time())
+        self._snapshot = snapshot
+        return snapshot
+
+    def overdue(self):
+        """True when latest() would recompute before returning"""
+        snapshot = self._snapshot
+        return snapshot is None or (not self.running and time.time() - snapshot.computed_at >= self.interval)
+
+    def latest(self):
+        """The newest snapshot, computing one first if none exists or it is overdue"""
+        if self.overdue():
+            return self.refresh_now()
+        return self._snapshot
+
+    def age(self):
+        """Seconds since the latest snapshot was computed (None before the first one)"""
+        snapshot = self._snapshot
+        return None if snapshot is None else time.time() - snapshot.computed_at
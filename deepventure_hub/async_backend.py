@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import json
+
+from deepventure_backend import REQUEST_TIMEOUT, DeepVentureBackend, simulation_query
+from startup import lazy_import
+
+
+class AsyncDeepVentureBackend:
+    """asyncio front end to a DeepVentureBackend.
+
+    datasets-server requests go through one httpx.AsyncClient whose
+    connection limits are shared by every caller on the event loop. Model
+    inference runs on the wrapped backend's thread pool so the loop never
+    blocks on it. The response cache, local index, models, rate limiter and
+    metrics are the wrapped backend's, so sync and async callers share them.
+    """
+
+    def __init__(self, backend=None, max_connections=64, max_keepalive_connections=16, **backend_kwargs):
+        self._owns_backend = backend is None
+        self.backend = backend or DeepVentureBackend(**backend_kwargs)
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self._client = None
+        # (query, limit) key -> future of the request already in flight on this loop
+        self._in_flight = {}
+        self._analytics_task = None
+
+    @property
+    def client(self):
+        """httpx.AsyncClient, created on first use inside the running event loop"""
+        if self._client is None:
+            httpx = lazy_import("httpx")
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_keepalive_connections),
+                timeout=REQUEST_TIMEOUT,
+                headers={"Authorization": f"Bearer {self.backend.hf_api_token}"})
+        return self._client
+
+    async def _run(self, fn, *args):
+        """Run CPU-bound work on the backend's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.backend._executor, functools.partial(fn, *args))
+
+    async def _fetch_hf_data(self, query, limit=5):
+        """Async _fetch_hf_data: local index on the thread pool, otherwise cache then HTTP"""
+        backend = self.backend
+        if backend.local_index is not None:
+            return await self._run(backend._fetch_hf_data, query, limit)
+        with backend.metrics.timer("deepventure_stage_seconds", stage="fetch"):
+            key = json.dumps([query, limit])
+            rows = await backend.cache.get_or_load_async(key, lambda: self._fetch_coalesced(key, query, limit))
+        return rows if rows is not None else []
+
+    async def _fetch_coalesced(self, key, query, limit):
+        """_fetch_remote, shared with any coroutine already fetching the same key.
+
+        If the coroutine leading a fetch is cancelled, its waiters are woken
+        and the first of them starts the fetch again.
+        """
+        pending = self._in_flight.get(key)
+        while pending is not None:
+            self.backend.metrics.inc("deepventure_upstream_coalesced_total")
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():  # this coroutine was cancelled, not the leader
+                    raise
+            pending = self._in_flight.get(key)
+        pending = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            rows = await self._fetch_remote(query, limit)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as exc:
+            pending.set_exception(exc)
+            pending.exception()  # retrieved here; waiters re-raise it
+            raise
+        else:
+            pending.set_result(rows)
+        finally:
+            del self._in_flight[key]
+        return rows
+
+    async def _fetch_remote(self, query, limit):
+        """Query datasets-server; returns None on a non-200 response so it isn't cached"""
+        backend = self.backend
+        if backend.rate_limiter is not None and not backend._record_throttle(
+                await backend.rate_limiter.acquire_async()):
+            return None
+        with backend._upstream_call():
+            response = await self.client.get(backend.api_url, params=backend._request_params(query, limit))
+        return backend._rows_from_response(response)
+
+    async def _fetch_many(self, queries):
+        """Fetch several (query, limit) pairs concurrently, returning rows in input order"""
+        unique = list(dict.fromkeys(queries))
+        rows = await asyncio.gather(*(self._fetch_hf_data(*q) for q in unique))
+        results = dict(zip(unique, rows))
+        return [results[q] for q in queries]
+
+    async def evaluate_idea(self, description):
+        """Async evaluate_idea"""
+        with self.backend.metrics.timer("deepventure_method_seconds", method="async_evaluate_idea"):
+            rows = await self._fetch_hf_data(description, limit=5)
+            return await self._run(self.backend._score_from_rows, description, rows)
+
+    async def run_simulation(self, title, description, score):
+        """Async run_simulation"""
+        with self.backend.metrics.timer("deepventure_method_seconds", method="async_run_simulation"):
+            rows = await self._fetch_hf_data(simulation_query(description), limit=10)
+            return await self._run(self.backend._simulate_from_rows, score, rows)
+
+    async def evaluate_and_simulate(self, title, description):
+        """Async evaluate_and_simulate; both fetches run concurrently"""
+        with self.backend.metrics.timer("deepventure_method_seconds", method="async_evaluate_and_simulate"):
+            eval_rows, sim_rows = await self._fetch_many([(description, 5), (simulation_query(description), 10)])
+            score = await self._run(self.backend._score_from_rows, description, eval_rows)
+            return score, await self._run(self.backend._simulate_from_rows, score, sim_rows)
+
+    async def iter_evaluation(self, title, description):
+        """Async iter_evaluation: yields ("score" | "mentor" | "microlearning" | "simulation", value)"""
+        backend = self.backend
+        with backend.metrics.timer("deepventure_method_seconds", method="async_iter_evaluation"):
+            sim_fetch = asyncio.ensure_future(self._fetch_hf_data(simulation_query(description), 10))
+            try:
+                eval_rows = await self._fetch_hf_data(description, 5)
+                score = await self._run(backend._score_from_rows, description, eval_rows)
+                yield "score", score
+                yield "mentor", await self._run(backend.match_mentor, description)
+                yield "microlearning", await self._run(backend.get_microlearning, "business")
+                yield "simulation", await self._run(backend._simulate_from_rows, score, await sim_fetch)
+            finally:
+                sim_fetch.cancel()
+
+    async def get_analytics(self):
+        """Async get_analytics; concurrent callers share one recomputation"""
+        refresher = self.backend._analytics
+        if not refresher.overdue():
+            return refresher.latest().to_dict()
+        if self._analytics_task is None or self._analytics_task.done():
+            self._analytics_task = asyncio.ensure_future(self._compute_analytics())
+        return (await asyncio.shield(self._analytics_task)).to_dict()
+
+    async def _compute_analytics(self):
+        backend = self.backend
+        if backend._uses_corpus():
+            data = await self._run(backend._compute_analytics)
+        else:
+            rows = await self._fetch_many(backend._analytics_queries())
+            data = await self._run(backend._analytics_from_rows, rows)
+        return backend._analytics.publish(data)
+
+    async def aclose(self):
+        """Close the HTTP client, and the wrapped backend if this object created it"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._owns_backend:
+            self.backend.close()
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from fake_datasets_server import FakeDatasetsServer
+
+SAMPLE_IDEAS = [
+    ("Farm Fresh", "Restaurant sourcing ingredients from local farms with a seasonal menu"),
+    ("CodeMentor", "Online tech platform pairing junior developers with senior mentors"),
+    ("CleanSweep", "Service business offering eco-friendly office cleaning subscriptions"),
+    ("PetPal", "Mobile app for booking vetted pet sitters and dog walkers"),
+    ("Budget Bites", "Affordable meal kits for students delivered weekly"),
+    ("FixIt", "On-demand home repair service with transparent upfront pricing"),
+]
+# Latency/throughput metrics compared against a baseline; higher-is-worse
+# unless listed in HIGHER_IS_BETTER.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "throughput_per_s")
+HIGHER_IS_BETTER = {"throughput_per_s"}
+
+
+def method_calls(backend):
+    """Benchmarked callables, each taking the i-th sample idea"""
+    from certificates import generate_certificate
+
+    def idea(i):
+        return SAMPLE_IDEAS[i % len(SAMPLE_IDEAS)]
+
+    return {
+        "evaluate_idea": lambda i: backend.evaluate_idea(idea(i)[1]),
+        "run_simulation": lambda i: backend.run_simulation(*idea(i), 70),
+        "match_mentor": lambda i: backend.match_mentor(idea(i)[1]),
+        "get_microlearning": lambda i: backend.get_microlearning(idea(i)[1]),
+        "get_analytics": lambda i: backend.get_analytics(),
+        "generate_certificate": lambda i: generate_certificate(idea(i)[0], "business"),
+    }
+
+
+def measure(fn, iterations, warmup, memory_iterations):
+    for i in range(warmup):
+        fn(i)
+    latencies = np.empty(iterations)
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+    # Peak memory is measured in a separate pass so tracing doesn't skew latency
+    tracemalloc.start()
+    for i in range(memory_iterations):
+        fn(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    p50, p90, p95, p99 = np.percentile(latencies * 1000, [50, 90, 95, 99])
+    return {
+        "calls": iterations,
+        "mean_ms": round(float(latencies.mean() * 1000), 3),
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(latencies.max() * 1000), 3),
+        "throughput_per_s": round(iterations / elapsed, 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run(methods=None, iterations=200, warmup=10, memory_iterations=20, latency=0.005, jitter=0.0,
+        error_rate=0.0, use_cache=False):
+    """Benchmark backend hot paths against a local datasets-server stand-in"""
+    from deepventure_backend import DeepVentureBackend
+    from response_cache import ResponseCache
+
+    # Recompute analytics on every call instead of serving a snapshot
+    os.environ["DEEPVENTURE_ANALYTICS_INTERVAL"] = "0"
+    with FakeDatasetsServer(latency=latency, jitter=jitter, error_rate=error_rate) as server:
+        cache = None if use_cache else ResponseCache(max_entries=0)
+        backend = DeepVentureBackend("benchmark", api_url=server.url, cache=cache)
+        backend.warm_up()
+        calls = method_calls(backend)
+        results = {}
+        for name in methods or calls:
+            results[name] = measure(calls[name], iterations, warmup, memory_iterations)
+            print(f"{name:22s} p50 {results[name]['p50_ms']:9.3f} ms  p99 {results[name]['p99_ms']:9.3f} ms  "
+                  f"{results[name]['throughput_per_s']:9.1f}/s", file=sys.stderr)
+        backend.close()
+        upstream = dict(server.counts)
+    return {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "config": {"iterations": iterations, "warmup": warmup, "latency": latency, "jitter": jitter,
+                   "error_rate": error_rate, "use_cache": use_cache},
+        "upstream": upstream,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Regression messages for metrics worse than baseline by more than `tolerance` (a fraction)"""
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous[metric], current[metric]
+            if metric in HIGHER_IS_BETTER:
+                worse = new < old * (1 - tolerance)
+            else:
+                worse = new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{name}.{metric}: {old} -> {new}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DeepVentureBackend hot paths offline")
+    parser.add_argument("--methods", nargs="*", default=None)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005, help="Stand-in latency per request, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None, help="Fail if results regress against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    report = run(args.methods, args.iterations, args.warmup, latency=args.latency, jitter=args.jitter,
+                 error_rate=args.error_rate, use_cache=args.cache)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+        print("No regressions against baseline", file=sys.stderr)
@@ -0,0 +1,253 @@
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from simulation_net import SimulationNet
+from startup import lazy_import
+
+# Set in each worker process by _init_worker
+_backend = None
+
+
+def read_ideas(path):
+    """Stream (id, title, description) from a CSV or JSONL file, one row at a time"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for n, row in enumerate(rows):
+            yield row.get("id", n), row.get("title", ""), row["description"]
+
+
+def _init_worker(backend_kwargs, simulation_weights):
+    """Build and warm up one backend per worker process"""
+    global _backend
+    from deepventure_backend import DeepVentureBackend
+    from simulation_net import SimulationNet
+    _backend = DeepVentureBackend(backend_kwargs.pop("hf_api_token", ""),
+                                  simulation_net=SimulationNet(simulation_weights), **backend_kwargs)
+    _backend.warm_up()
+
+
+def _error_record(idea_id, title, error):
+    return {"id": idea_id, "title": title, "error": error}
+
+
+def _evaluate_batch(ideas):
+    ids, titles, descriptions = zip(*ideas)
+    scores = _backend.evaluate_ideas(descriptions)
+    simulations = _backend.run_simulations(titles, descriptions, scores)
+    mentors = _backend.match_mentor_batch(descriptions)
+    return [
+        {"id": idea_id, "title": title, "score": int(score),
+         "success_rate": float(simulation["success_rate"]),
+         "market_potential": float(simulation["market_potential"]),
+         "risk_factor": float(simulation["risk_factor"]), "mentor": mentor}
+        for idea_id, title, score, simulation, mentor in zip(ids, titles, scores, simulations, mentors)
+    ]
+
+
+def _evaluate_chunk(ideas):
+    """Score, simulate and match mentors for a chunk using the batched backend APIs.
+
+    Rows without a description are reported as errors up front. If the batch
+    still fails, its rows are retried one at a time so only the rows that
+    fail themselves are written as errors.
+    """
+    records = {}
+    valid = []
+    for n, (idea_id, title, description) in enumerate(ideas):
+        if description and description.strip():
+            valid.append((n, (idea_id, title, description)))
+        else:
+            records[n] = _error_record(idea_id, title, "ValueError: empty description")
+    if valid:
+        try:
+            results = _evaluate_batch([idea for _, idea in valid])
+        except Exception:
+            results = []
+            for _, idea in valid:
+                try:
+                    results.extend(_evaluate_batch([idea]))
+                except Exception as e:
+                    results.append(_error_record(idea[0], idea[1], f"{type(e).__name__}: {e}"))
+        records.update((n, record) for (n, _), record in zip(valid, results))
+    return [records[n] for n in range(len(ideas))]
+
+
+class JsonlWriter:
+    """Appends result rows to a JSONL file; a checkpoint records the committed byte offset"""
+
+    def __init__(self, path, state=None):
+        self.path = path
+        self._file = open(path, "a+", encoding="utf-8")
+        # Drop anything written after the last checkpoint
+        self._file.truncate((state or {}).get("bytes", 0))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record) + "\n")
+
+    def commit(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {"bytes": self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes result rows to a directory of Parquet part files, one per checkpoint"""
+
+    def __init__(self, path, state=None):
+        self._pa = lazy_import("pyarrow")
+        self._pq = lazy_import("pyarrow.parquet")
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.parts = (state or {}).get("parts", 0)
+        # Drop parts written after the last checkpoint
+        for part in glob.glob(os.path.join(path, "part-*.parquet")):
+            if int(os.path.basename(part)[5:10]) >= self.parts:
+                os.remove(part)
+        self._buffer = []
+
+    def write(self, records):
+        self._buffer.extend(records)
+
+    def commit(self):
+        if self._buffer:
+            table = self._pa.Table.from_pylist(self._buffer)
+            self._pq.write_table(table, os.path.join(self.path, f"part-{self.parts:05d}.parquet"))
+            self.parts += 1
+            self._buffer = []
+        return {"parts": self.parts}
+
+    def close(self):
+        pass
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def run(input_path, output_path, fmt="jsonl", workers=None, chunk_size=64, checkpoint_every=1024,
+        resume=True, backend_kwargs=None, progress_interval=5.0):
+    """Evaluate every idea in `input_path`, writing results in input order.
+
+    At most 2 chunks per worker are in flight, so memory stays constant no
+    matter how large the input is. After every `checkpoint_every` rows the
+    output is committed and the row count saved next to it, and a rerun
+    continues from there.
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint_path = output_path.rstrip("/") + ".checkpoint"
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is not None and checkpoint.get("input") != os.path.abspath(input_path):
+        raise ValueError(f"{checkpoint_path} belongs to {checkpoint.get('input')}; pass --restart to overwrite")
+    done = checkpoint["rows"] if checkpoint else 0
+    writer_state = checkpoint["writer"] if checkpoint else None
+    writer = ParquetWriter(output_path, writer_state) if fmt == "parquet" else JsonlWriter(output_path, writer_state)
+    if done:
+        print(f"Resuming after {done} rows", file=sys.stderr)
+
+    ideas = itertools.islice(read_ideas(input_path), done, None)
+    chunks = iter(lambda: list(itertools.islice(ideas, chunk_size)), [])
+    max_in_flight = 2 * workers
+    started = time.time()
+    last_report = started
+    processed = errors = 0
+    since_checkpoint = 0
+    pending = {}  # future -> chunk number
+    finished = {}  # chunk number -> records, held until earlier chunks are written
+    next_submit = next_write = 0
+    # Without a model artifact every worker would draw its own random
+    # simulation weights; draw them once here so results don't depend on
+    # which worker scored a row
+    simulation_weights = SimulationNet.initialize().weights
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dict(backend_kwargs or {}), simulation_weights)) as pool:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(_evaluate_chunk, chunk)] = next_submit
+                next_submit += 1
+            if not pending:
+                break
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finished[pending.pop(future)] = future.result()
+            while next_write in finished:
+                records = finished.pop(next_write)
+                next_write += 1
+                writer.write(records)
+                processed += len(records)
+                errors += sum(1 for record in records if "error" in record)
+                since_checkpoint += len(records)
+                if since_checkpoint >= checkpoint_every:
+                    save_checkpoint(checkpoint_path, {"input": os.path.abspath(input_path),
+                                                      "rows": done + processed, "writer": writer.commit()})
+                    since_checkpoint = 0
+            now = time.time()
+            if now - last_report >= progress_interval:
+                last_report = now
+                print(f"{done + processed} rows ({processed / (now - started):.1f} rows/s, {errors} errors)",
+                      file=sys.stderr)
+    save_checkpoint(checkpoint_path, {"input": os.path.abspath(input_path), "rows": done + processed,
+                                      "writer": writer.commit(), "complete": True})
+    writer.close()
+    elapsed = time.time() - started
+    summary = {"rows": done + processed, "processed": processed, "errors": errors,
+               "seconds": round(elapsed, 2), "rows_per_s": round(processed / elapsed, 2) if elapsed else 0.0}
+    print(f"Done: {summary}", file=sys.stderr)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a CSV/JSONL file of ideas (title, description[, id])")
+    parser.add_argument("input")
+    parser.add_argument("output", help="JSONL file, or a directory of part files with --format parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default=None,
+                        help="Default: parquet if the output ends in .parquet, else jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Ideas per batched backend call")
+    parser.add_argument("--checkpoint-every", type=int, default=1024, help="Rows between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start over")
+    parser.add_argument("--token", default=os.environ.get("HF_API_TOKEN", ""), help="Hugging Face API token")
+    parser.add_argument("--index", default=None, help="Local review index (see local_reviews.py)")
+    parser.add_argument("--model-dir", default=None, help="Trained model artifacts (see model_store.py)")
+    parser.add_argument("--api-url", default=None, help="datasets-server /rows URL override")
+    args = parser.parse_args()
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow (pip install pyarrow); use a .jsonl output instead")
+    run(args.input, args.output, fmt, args.workers, args.chunk_size, args.checkpoint_every,
+        resume=not args.restart,
+        backend_kwargs={"hf_api_token": args.token, "local_index_path": args.index,
+                        "model_dir": args.model_dir, "api_url": args.api_url})
@@ -0,0 +1,134 @@
+import io
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from PIL import Image as PILImage, ImageDraw, ImageFont
+
+MAX_CERTIFICATES = 1024
+PNG_SIZE = (800, 600)
+
+Certificate = namedtuple("Certificate", ["name", "category", "credential_id", "date"])
+
+
+@lru_cache(maxsize=None)
+def _fonts():
+    """Title and body fonts, loaded once per process"""
+    try:
+        return ImageFont.truetype("arial.ttf", 40), ImageFont.truetype("arial.ttf", 20)
+    except OSError:
+        return ImageFont.load_default(), ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles():
+    """ReportLab page styles, built once per process"""
+    styles = getSampleStyleSheet()
+    styles['Title'].textColor = colors.purple
+    styles['BodyText'].fontSize = 14
+    return styles
+
+
+def new_certificate(name: str, category: str) -> Certificate:
+    return Certificate(name, category, str(uuid.uuid4())[:8].upper(), datetime.now().strftime('%Y-%m-%d'))
+
+
+def render_pdf(cert: Certificate) -> bytes:
+    styles = _pdf_styles()
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
+    story = [
+        Paragraph("Certificate of Completion", styles['Title']),
+        Spacer(1, 36),
+        Paragraph(f"Awarded to: {cert.name}", styles['BodyText']),
+        Paragraph(f"For successfully completing the {cert.category.capitalize()} Microlearning Module", styles['BodyText']),
+        Paragraph(f"Date: {cert.date}", styles['BodyText']),
+        Paragraph(f"Credential ID: {cert.credential_id}", styles['BodyText']),
+        Spacer(1, 24),
+        Paragraph("Provided by DeepVision", styles['BodyText']),
+    ]
+    doc.build(story)
+    return pdf_buffer.getvalue()
+
+
+def render_png(cert: Certificate) -> bytes:
+    title_font, text_font = _fonts()
+    png_image = PILImage.new('RGB', PNG_SIZE, color='#ffffff')
+    draw = ImageDraw.Draw(png_image)
+    draw.text((50, 50), "Certificate of Completion", fill='#800080', font=title_font)
+    draw.text((50, 150), f"Awarded to: {cert.name}", fill='black', font=text_font)
+    draw.text((50, 200), f"For: {cert.category.capitalize()} Module", fill='black', font=text_font)
+    draw.text((50, 250), f"Date: {cert.date}", fill='black', font=text_font)
+    draw.text((50, 300), f"Credential ID: {cert.credential_id}", fill='black', font=text_font)
+    draw.text((50, 400), "Provided by DeepVision", fill='#800080', font=text_font)
+    png_buffer = io.BytesIO()
+    png_image.save(png_buffer, format="PNG")
+    return png_buffer.getvalue()
+
+
+def generate_certificate(name: str, category: str) -> tuple:
+    """Issue and render a fresh certificate: (pdf_bytes, png_bytes, credential_id)"""
+    cert = new_certificate(name, category)
+    return render_pdf(cert), render_png(cert), cert.credential_id
+
+
+class CertificateStore:
+    """Issues one certificate per (name, category) and renders its files off the rerun path.
+
+    Issued certificates live in a bounded LRU; PDF/PNG bytes are rendered at
+    most once per certificate on a background worker.
+    """
+
+    def __init__(self, max_entries=MAX_CERTIFICATES, max_workers=2):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (name, category) -> {"cert", "pdf", "png"}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="certificates")
+
+    def issue(self, name: str, category: str) -> Certificate:
+        """Return the certificate for (name, category), minting it on first request"""
+        key = (name, category)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"cert": new_certificate(name, category), "pdf": None, "png": None}
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._entries.move_to_end(key)
+            return entry["cert"]
+
+    def render_async(self, cert: Certificate):
+        """Start rendering the PDF and PNG in the background (no-op if already started)"""
+        with self._lock:
+            entry = self._entries.get((cert.name, cert.category))
+            if entry is None or entry["cert"] != cert:
+                return
+            if entry["pdf"] is None:
+                entry["pdf"] = self._executor.submit(render_pdf, cert)
+                entry["png"] = self._executor.submit(render_png, cert)
+
+    def is_rendered(self, cert: Certificate) -> bool:
+        with self._lock:
+            entry = self._entries.get((cert.name, cert.category))
+        return entry is not None and entry["pdf"] is not None and entry["pdf"].done() and entry["png"].done()
+
+    def files(self, cert: Certificate) -> tuple:
+        """(pdf_bytes, png_bytes), rendering now if the background job hasn't run"""
+        self.render_async(cert)
+        with self._lock:
+            entry = self._entries.get((cert.name, cert.category))
+        if entry is None or entry["cert"] != cert:
+            # Evicted meanwhile; render directly without caching
+            return render_pdf(cert), render_png(cert)
+        return entry["pdf"].result(), entry["png"].result()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
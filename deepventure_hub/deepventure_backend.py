@@ -1,31 +1,187 @@
-import pandas as pd
+import json
+import os
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-import tensorflow as tf
 import random
-import requests
-from datasets import load_dataset  # Optional, for local training
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from analytics import CATEGORY_KEYWORDS, AnalyticsRefresher, CorpusAggregator
+from flow_control import SingleFlight, shared_bucket
+from learning_catalog import LearningCatalog
+from metrics import SIZE_BUCKETS, MetricsRegistry, instrumented
+from local_reviews import LocalReviewIndex
+from mentor_index import MentorIndex
+import model_store
+from online_learning import OnlineEvaluator
+from response_cache import ResponseCache
+from scenarios import DEFAULT_SCENARIOS, simulate_scenarios
+from simulation_net import SimulationNet
+from startup import lazy_import, startup_report, timed
+
+HF_ROWS_URL = "https://datasets-server.huggingface.co/rows"
+REQUEST_TIMEOUT = 30  # seconds
+ANALYTICS_CATEGORIES = ("restaurant", "tech", "service")
+
+
+def simulation_query(description):
+    """Search term for simulation rows: the description's first word ("" if it has none)"""
+    words = description.split(maxsplit=1)
+    return words[0] if words else ""
 
 class DeepVentureBackend:
-    def __init__(self, hf_api_token):
+    def __init__(self, hf_api_token, local_index_path=None, max_workers=8, cache=None,
+                 model_dir=None, model_version=None, api_url=None, rate_limiter=None, simulation_net=None):
         self.hf_api_token = hf_api_token
-        self.vectorizer = TfidfVectorizer(max_features=1000)
-        self.model = LinearRegression()
-        self.simulation_model = self._build_simulation_model()
+        # Overridable so benchmarks and load tests can point at a local stand-in
+        self.api_url = api_url or os.environ.get("DEEPVENTURE_HF_API_URL", HF_ROWS_URL)
+        self.max_workers = max_workers
+        self.metrics = MetricsRegistry()
+        self.metrics.describe("deepventure_method_seconds", "Latency of public backend methods")
+        self.metrics.describe("deepventure_stage_seconds", "Latency of internal stages (fetch, transform, predict)")
+        self.metrics.describe("deepventure_upstream_responses_total", "datasets-server responses by HTTP status")
+        self.metrics.describe("deepventure_upstream_errors_total", "datasets-server requests that raised")
+        self.metrics.describe("deepventure_upstream_payload_bytes", "datasets-server response body size")
+        self.metrics.describe("deepventure_upstream_coalesced_total", "Fetches that shared an in-flight request")
+        self.metrics.describe("deepventure_upstream_throttled_total", "Requests delayed or rejected by the rate limiter")
+        self.metrics.describe("deepventure_fallback_total", "Results made up at random because no rows were available")
+        # Heavy pieces (HTTP session, sklearn models) are built on first use
+        self._session = None
+        self.vectorizer = None
+        self.model = None
+        self._evaluator_ready = False
+        self.online_evaluator = None
+        self._online_offsets = {}  # query -> rows already fed to the online model
+        self._online_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hf-fetch")
+        # Remote responses are cached per (query, limit); set
+        # DEEPVENTURE_CACHE_PATH to keep them across restarts, or
+        # DEEPVENTURE_CACHE_ENTRIES=0 to turn caching off.
+        if cache is None:
+            max_entries = int(os.environ.get("DEEPVENTURE_CACHE_ENTRIES", 1024))
+            cache = ResponseCache(max_entries=max_entries,
+                                  disk_path=os.environ.get("DEEPVENTURE_CACHE_PATH") if max_entries else None,
+                                  executor=self._executor)
+        self.cache = cache
+        self.metrics.add_collector(self._cache_gauges)
+        # Concurrent misses for the same (query, limit) share one request, and
+        # upstream traffic goes through a process-wide token bucket when
+        # DEEPVENTURE_HF_RATE_LIMIT (requests/s) is set.
+        self._single_flight = SingleFlight()
+        if rate_limiter is None and os.environ.get("DEEPVENTURE_HF_RATE_LIMIT"):
+            rate_limiter = shared_bucket(float(os.environ["DEEPVENTURE_HF_RATE_LIMIT"]),
+                                         int(os.environ.get("DEEPVENTURE_HF_RATE_BURST", 5)),
+                                         float(os.environ.get("DEEPVENTURE_HF_MAX_QUEUE_WAIT", 10)))
+        self.rate_limiter = rate_limiter
+        self.metrics.add_collector(self._flow_gauges)
+        # Offline mode: answer _fetch_hf_data from a prebuilt local index
+        # (see local_reviews.py) instead of datasets-server.
+        if local_index_path is None:
+            local_index_path = os.environ.get("DEEPVENTURE_LOCAL_INDEX")
+        self.local_index = None
+        if local_index_path:
+            with timed("local_index"):
+                self.local_index = LocalReviewIndex(local_index_path)
+        # Trained artifacts (see model_store.py) replace mock training when present
+        self.artifact_path = model_store.resolve(
+            model_dir or os.environ.get("DEEPVENTURE_MODEL_DIR"),
+            model_version or os.environ.get("DEEPVENTURE_MODEL_VERSION"))
+        # Inference runs in NumPy; TensorFlow is only imported to retrain.
+        # Without an artifact, `simulation_net` lets several backends share
+        # one set of fresh weights.
+        with timed("simulation_net"):
+            if self.artifact_path:
+                self.simulation_net = model_store.load_simulation_net(self.artifact_path)
+            else:
+                self.simulation_net = simulation_net or SimulationNet.initialize()
         self.mentors = {
             "restaurant": ["John Food", "Sarah Chef"],
             "tech": ["Mike Tech"],
             "service": ["Emma Service"]
         }
+        # Ranked matching over mentor profiles; DEEPVENTURE_MENTORS_PATH points
+        # at a JSONL file of {"name", "category", "keywords", "bio"} profiles.
+        with timed("mentor_index"):
+            mentors_path = os.environ.get("DEEPVENTURE_MENTORS_PATH")
+            if mentors_path:
+                self.mentor_index = MentorIndex.from_jsonl(mentors_path)
+            else:
+                self.mentor_index = MentorIndex(
+                    {"name": name, "category": category}
+                    for category, names in self.mentors.items() for name in names)
         self.microlearning = {
             "business": ["Business Strategy", "Market Entry"],
             "marketing": ["Digital Marketing", "Branding"],
             "finance": ["Cash Flow", "Investment Basics"]
         }
-        # Train with mock data initially
-        self._train_evaluation_model_with_mock_data()
+        # DEEPVENTURE_CATALOG_PATH (JSON/JSONL) replaces the built-in modules;
+        # it is read on first lookup.
+        catalog_path = os.environ.get("DEEPVENTURE_CATALOG_PATH")
+        if catalog_path:
+            self.catalog = LearningCatalog(path=catalog_path)
+        else:
+            self.catalog = LearningCatalog(
+                {"title": title, "category": category}
+                for category, titles in self.microlearning.items() for title in titles)
+        # Full-corpus statistics, built on the first analytics refresh that needs them
+        self._corpus = None
+        # Dashboards read the latest snapshot; see start_analytics_refresher()
+        self._analytics = AnalyticsRefresher(
+            self._compute_analytics, interval=float(os.environ.get("DEEPVENTURE_ANALYTICS_INTERVAL", 60)))
+
+    def _ensure_evaluator(self):
+        """Build and fit the TF-IDF/regression evaluator on first use"""
+        if self._evaluator_ready:
+            return
+        with self._init_lock:
+            if self._evaluator_ready:
+                return
+            with timed("evaluation_model"):
+                if self.artifact_path:
+                    self.vectorizer, self.model = model_store.load_evaluator(self.artifact_path)
+                else:
+                    text = lazy_import("sklearn.feature_extraction.text")
+                    linear_model = lazy_import("sklearn.linear_model")
+                    self.vectorizer = text.TfidfVectorizer(max_features=1000)
+                    self.model = linear_model.LinearRegression()
+                    # No artifact: train with mock data initially
+                    self._train_evaluation_model_with_mock_data()
+            self._evaluator_ready = True
+
+    @property
+    def session(self):
+        """Keep-alive HTTP session shared by all fetches, created on first use"""
+        if self._session is None:
+            with self._init_lock:
+                if self._session is None:
+                    with timed("http_session"):
+                        requests = lazy_import("requests")
+                        adapters = lazy_import("requests.adapters")
+                        # Sized to the worker pool so concurrent requests reuse
+                        # connections instead of opening new ones.
+                        session = requests.Session()
+                        adapter = adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+                        session.mount("https://", adapter)
+                        session.mount("http://", adapter)
+                        session.headers["Authorization"] = f"Bearer {self.hf_api_token}"
+                        self._session = session
+        return self._session
+
+    def warm_up(self, background=False):
+        """Build the deferred components ahead of the first request"""
+        if background:
+            thread = threading.Thread(target=self.warm_up, name="backend-warm-up", daemon=True)
+            thread.start()
+            return thread
+        self._ensure_evaluator()
+        if self.local_index is None:
+            self.session  # opens the pooled HTTP session
+
+    def startup_report(self):
+        """Import time per lazily loaded module and init time per component, in seconds"""
+        return startup_report()
 
     def _train_evaluation_model_with_mock_data(self):
         # Mock data for initial model (updated later with API data)
@@ -34,18 +190,53 @@ class DeepVentureBackend:
         X = self.vectorizer.fit_transform(mock_descriptions)
         self.model.fit(X, np.array(mock_scores))
 
-    def _build_simulation_model(self):
-        model = tf.keras.Sequential([
-            tf.keras.layers.Dense(64, activation='relu', input_shape=(1,)),
-            tf.keras.layers.Dense(32, activation='relu'),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
-        model.compile(optimizer='adam', loss='mse')
+    def retrain_simulation_model(self, scores, success_rates, epochs=10):
+        """Fit the simulation MLP in Keras on (0-100 score, 0-1 success rate) pairs"""
+        model = self.simulation_net.to_keras()
+        x = np.asarray(scores, dtype=float).reshape(-1, 1) / 100
+        model.fit(x, np.asarray(success_rates, dtype=float), epochs=epochs, verbose=0)
+        self.simulation_net = SimulationNet.from_keras(model)
         return model
 
     def _fetch_hf_data(self, query, limit=5):
         """Fetch data from Hugging Face yelp_review_full dataset"""
-        url = "https://datasets-server.huggingface.co/rows"
+        if self.local_index is not None:
+            with self.metrics.timer("deepventure_stage_seconds", stage="local_index_search"):
+                return self.local_index.search(query, limit)
+        with self.metrics.timer("deepventure_stage_seconds", stage="fetch"):
+            key = json.dumps([query, limit])
+            rows = self.cache.get_or_load(key, lambda: self._fetch_coalesced(key, query, limit))
+        return rows if rows is not None else []
+
+    def _fetch_coalesced(self, key, query, limit):
+        """_fetch_remote, shared with any caller already fetching the same key"""
+        rows, shared = self._single_flight.do(key, lambda: self._fetch_remote(query, limit))
+        if shared:
+            self.metrics.inc("deepventure_upstream_coalesced_total")
+        return rows
+
+    def _fetch_remote(self, query, limit, offset=0):
+        """Query datasets-server; returns None on a non-200 response so it isn't cached"""
+        if self.rate_limiter is not None and not self._record_throttle(self.rate_limiter.acquire()):
+            return None
+        with self._upstream_call():
+            response = self.session.get(self.api_url, params=self._request_params(query, limit, offset),
+                                        timeout=REQUEST_TIMEOUT)
+        return self._rows_from_response(response)
+
+    # Shared with AsyncDeepVentureBackend, which only swaps the limiter wait and HTTP call
+
+    def _record_throttle(self, wait):
+        """Count a rate limiter outcome; False if the request was turned away"""
+        if wait is None:
+            self.metrics.inc("deepventure_upstream_throttled_total", outcome="rejected")
+            return False
+        if wait:
+            self.metrics.inc("deepventure_upstream_throttled_total", outcome="delayed")
+            self.metrics.observe("deepventure_stage_seconds", wait, stage="rate_limit_wait")
+        return True
+
+    def _request_params(self, query, limit, offset=0):
         params = {
             "dataset": "yelp_review_full",
             "config": "yelp_review_full",
@@ -53,30 +244,200 @@ class DeepVentureBackend:
             "query": query,  # Search term (approximate match)
             "limit": limit
         }
-        headers = {"Authorization": f"Bearer {self.hf_api_token}"}
-        response = requests.get(url, headers=headers, params=params)
-        
+        if offset:
+            params["offset"] = offset
+        return params
+
+    @contextmanager
+    def _upstream_call(self):
+        """Time the HTTP request and count the ones that raise"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.metrics.inc("deepventure_upstream_errors_total", error=type(exc).__name__)
+            raise
+        finally:
+            self.metrics.observe("deepventure_stage_seconds", time.perf_counter() - start, stage="upstream_request")
+
+    def _rows_from_response(self, response):
+        """Rows of a 200 response, or None; works for requests and httpx responses"""
+        self.metrics.inc("deepventure_upstream_responses_total", status=response.status_code)
+        self.metrics.observe("deepventure_upstream_payload_bytes", len(response.content), buckets=SIZE_BUCKETS)
         if response.status_code == 200:
             data = response.json()
             return data.get("rows", [])
-        return []
+        return None
+
+    def _fetch_many(self, queries):
+        """Fetch several (query, limit) pairs concurrently, returning rows in input order"""
+        unique = list(dict.fromkeys(queries))
+        if len(unique) == 1 or self.local_index is not None:
+            results = {q: self._fetch_hf_data(*q) for q in unique}
+        else:
+            futures = {q: self._executor.submit(self._fetch_hf_data, *q) for q in unique}
+            results = {q: future.result() for q, future in futures.items()}
+        return [results[q] for q in queries]
+
+    def close(self):
+        """Release the fetch thread pool and pooled HTTP connections"""
+        self._analytics.stop()
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+        self.cache.close()
+
+    def cache_stats(self):
+        """Hit/miss/eviction counters of the response cache"""
+        return self.cache.stats()
+
+    def _cache_gauges(self):
+        return {(f"deepventure_cache_{name}", ()): value for name, value in self.cache_stats().items()}
+
+    def _flow_gauges(self):
+        gauges = {("deepventure_upstream_in_flight", ()): self._single_flight.in_flight()}
+        if self.rate_limiter is not None:
+            gauges[("deepventure_upstream_rate_limit_waiting", ())] = self.rate_limiter.waiting
+        return gauges
+
+    def metrics_snapshot(self):
+        """Counters, gauges and latency histogram summaries as a dict"""
+        return self.metrics.snapshot()
+
+    def metrics_text(self):
+        """All metrics in the Prometheus text format"""
+        return self.metrics.render_prometheus()
 
+    @instrumented
     def evaluate_idea(self, description):
         """Evaluate idea using Hugging Face dataset API"""
-        rows = self._fetch_hf_data(description, limit=5)
+        return self._score_from_rows(description, self._fetch_hf_data(description, limit=5))
+
+    @instrumented
+    def evaluate_ideas(self, descriptions):
+        """Evaluate many ideas with one TF-IDF transform, one predict and deduplicated fetches"""
+        descriptions = list(descriptions)
+        if not descriptions:
+            return []
+        all_rows = self._fetch_many([(description, 5) for description in descriptions])
+        predicted = self._predict_scores(descriptions)
+        return [self._combine_score(p, rows) for p, rows in zip(predicted, all_rows)]
+
+    def _score_from_rows(self, description, rows):
+        if rows:
+            return self._combine_score(self._predict_scores([description])[0], rows)
+        return self._combine_score(None, rows)
+
+    def _predict_scores(self, descriptions):
+        """Model scores for descriptions, from the online model once it has seen data"""
+        online = self.online_evaluator
+        if online is not None and online.ready:
+            with self.metrics.timer("deepventure_stage_seconds", stage="online_predict"):
+                return online.predict(descriptions)
+        self._ensure_evaluator()
+        with self.metrics.timer("deepventure_stage_seconds", stage="tfidf_transform"):
+            X = self.vectorizer.transform(descriptions)
+        with self.metrics.timer("deepventure_stage_seconds", stage="regression_predict"):
+            return self.model.predict(X)
+
+    def enable_online_learning(self, **params):
+        """Switch evaluation to an incrementally trained model (see online_learning.py).
+
+        evaluate_idea keeps using the batch model until the first update lands.
+        """
+        if self.online_evaluator is None:
+            self.online_evaluator = OnlineEvaluator(**params)
+        return self.online_evaluator
+
+    def update_online_model(self, rows=None, query="", limit=100):
+        """Fold review rows into the online model; fetches the next `query` rows if none are given.
+
+        Fetched rows are read as a stream: a cursor per query remembers how
+        many rows were already ingested, so each call trains on the following
+        `limit` rows (bypassing the response cache) and never on rows the
+        model has seen. Once the stream is exhausted nothing new is ingested.
+        """
+        online = self.enable_online_learning()
+        if rows is not None:
+            return online.ingest_rows(rows)
+        with self._online_lock:
+            offset = self._online_offsets.get(query, 0)
+            if self.local_index is not None:
+                rows = self.local_index.search(query, limit, offset)
+            else:
+                rows = self._fetch_remote(query, limit, offset) or []
+            self._online_offsets[query] = offset + len(rows)
+            return online.ingest_rows(rows)
+
+    def _combine_score(self, predicted, rows):
         if rows:
             avg_rating = np.mean([row["row"]["stars"] * 20 for row in rows])  # Convert 5-star to 100
-            X = self.vectorizer.transform([description])
-            score = self.model.predict(X)[0]
-            return min(max(int((score + avg_rating) / 2), 0), 100)
+            return min(max(int((predicted + avg_rating) / 2), 0), 100)
+        self.metrics.inc("deepventure_fallback_total", result="score")
         return random.randint(50, 90)  # Fallback
 
+    @instrumented
     def run_simulation(self, title, description, score):
         """Run simulation using Hugging Face dataset API"""
-        normalized_score = score / 100
-        prediction = self.simulation_model.predict(np.array([[normalized_score]]))[0][0]
-        
-        rows = self._fetch_hf_data(description.split()[0], limit=10)
+        return self._simulate_from_rows(score, self._fetch_hf_data(simulation_query(description), limit=10))
+
+    @instrumented
+    def run_monte_carlo(self, title, description, score, scenarios=DEFAULT_SCENARIOS, seed=None):
+        """Distributions (mean, percentiles, 95% CI) of the simulation metrics over many scenarios.
+
+        The default seed is derived from the description, so repeated runs
+        for the same idea return the same result.
+        """
+        if seed is None:
+            seed = zlib.crc32(description.encode("utf-8"))
+        rows = self._fetch_hf_data(simulation_query(description), limit=10)
+        return simulate_scenarios(
+            self.simulation_net.predict([score])[0],
+            [row["row"]["stars"] * 20 for row in rows],
+            [len(row["row"]["text"]) for row in rows],
+            n=scenarios, seed=seed)
+
+    @instrumented
+    def evaluate_and_simulate(self, title, description):
+        """Evaluate and simulate one idea, overlapping the two independent fetches"""
+        eval_rows, sim_rows = self._fetch_many([(description, 5), (simulation_query(description), 10)])
+        score = self._score_from_rows(description, eval_rows)
+        return score, self._simulate_from_rows(score, sim_rows)
+
+    def iter_evaluation(self, title, description):
+        """Yield (section, value) pairs for one idea as each part becomes ready.
+
+        Sections arrive as "score", "mentor", "microlearning" and finally
+        "simulation"; both data fetches start immediately.
+        """
+        with self.metrics.timer("deepventure_method_seconds", method="iter_evaluation"):
+            eval_future = self._executor.submit(self._fetch_hf_data, description, 5)
+            sim_future = self._executor.submit(self._fetch_hf_data, simulation_query(description), 10)
+            score = self._score_from_rows(description, eval_future.result())
+            yield "score", score
+            yield "mentor", self.match_mentor(description)
+            yield "microlearning", self.get_microlearning("business")
+            yield "simulation", self._simulate_from_rows(score, sim_future.result())
+
+    @instrumented
+    def run_simulations(self, titles, descriptions, scores):
+        """Simulate many ideas with one batched forward pass and deduplicated fetches"""
+        descriptions, scores = list(descriptions), list(scores)
+        if len(scores) != len(descriptions):
+            raise ValueError(f"got {len(descriptions)} descriptions but {len(scores)} scores")
+        if not descriptions:
+            return []
+        all_rows = self._fetch_many([(simulation_query(description), 10) for description in descriptions])
+        with self.metrics.timer("deepventure_stage_seconds", stage="simulation_predict"):
+            predictions = self.simulation_net.predict(scores)
+        return [self._simulation_result(p, rows) for p, rows in zip(predictions, all_rows)]
+
+    def _simulate_from_rows(self, score, rows):
+        with self.metrics.timer("deepventure_stage_seconds", stage="simulation_predict"):
+            prediction = self.simulation_net.predict([score])[0]
+        return self._simulation_result(prediction, rows)
+
+    def _simulation_result(self, prediction, rows):
         if rows:
             ratings = [row["row"]["stars"] * 20 for row in rows]
             # Use text length as a proxy for "review count" since API doesn’t provide this
@@ -84,40 +445,145 @@ class DeepVentureBackend:
             market_potential = min(np.mean(review_counts), 95)
             risk_factor = 50 - (np.mean(ratings) / 2)
         else:
+            self.metrics.inc("deepventure_fallback_total", result="simulation")
             market_potential = random.uniform(60, 95)
             risk_factor = random.uniform(10, 40)
 
         return {
-            "success_rate": round(prediction * 100, 2),
+            "success_rate": round(float(prediction) * 100, 2),
             "market_potential": round(market_potential, 2),
             "risk_factor": round(risk_factor, 2)
         }
 
+    @instrumented
     def match_mentor(self, description):
         """Match mentor based on keywords"""
-        description = description.lower()
-        for category, mentors in self.mentors.items():
-            if category in description:
-                return random.choice(mentors)
-        return random.choice(self.mentors["tech"])
+        return self._pick_mentor(self.mentor_index.search_best(description))
+
+    @instrumented
+    def match_mentors(self, description, k=5):
+        """Ranked top-k mentor profiles for a description, each with its id and score"""
+        return [dict(profile, id=mentor_id, score=round(score, 4))
+                for mentor_id, profile, score in self.mentor_index.search(description, k)]
+
+    @instrumented
+    def match_mentor_batch(self, descriptions):
+        """match_mentor for each description"""
+        return [self._pick_mentor(self.mentor_index.search_best(description)) for description in descriptions]
+
+    def _pick_mentor(self, best):
+        if not best:
+            return random.choice(self.mentors["tech"])
+        # Break ties at the top score randomly, as the keyword scan used to
+        return random.choice([profile["name"] for _, profile, _ in best])
+
+    def add_mentor(self, profile):
+        """Add a mentor profile to the index; returns its id"""
+        return self.mentor_index.add(profile)
+
+    def remove_mentor(self, mentor_id):
+        self.mentor_index.remove(mentor_id)
+
+    @instrumented
+    def get_microlearning(self, category, k=5):
+        """Get microlearning modules for a category, or the top-k matches for free text"""
+        modules = self.catalog.category(category)
+        if modules is None and category.strip():
+            modules = [module["title"] for module, _ in self.catalog.search(category, k)]
+        return modules or self.catalog.category("business") or []
 
-    def get_microlearning(self, category):
-        """Get microlearning modules"""
-        return self.microlearning.get(category, self.microlearning["business"])
+    def reload_catalog(self, refit=False):
+        """Pick up edits to the catalog file without rebuilding the whole index"""
+        return self.catalog.reload(refit=refit)
 
+    @instrumented
     def get_analytics(self):
-        """Fetch real-time analytics from Hugging Face dataset API"""
-        categories = ["restaurant", "tech", "service"]
+        """Latest analytics snapshot from Hugging Face dataset API, as a plain dict copy"""
+        return self._analytics.latest().to_dict()
+
+    def analytics_age(self):
+        """Seconds since the analytics snapshot served by get_analytics was computed"""
+        return self._analytics.age()
+
+    def start_analytics_refresher(self, interval=None):
+        """Recompute analytics in the background every `interval` seconds"""
+        if interval is not None:
+            self._analytics.interval = interval
+        self._analytics.start()
+
+    def _analytics_queries(self):
+        return [(category, 50) for category in ANALYTICS_CATEGORIES] + [("", 50)]
+
+    def _uses_corpus(self):
+        """Analytics come from full-corpus statistics rather than sampled fetches"""
+        return self.local_index is not None
+
+    def _ensure_corpus(self):
+        if self._corpus is None:
+            with self._init_lock:
+                if self._corpus is None:
+                    self._corpus = CorpusAggregator(
+                        {category: CATEGORY_KEYWORDS.get(category, (category,)) for category in ANALYTICS_CATEGORIES})
+        return self._corpus
+
+    def ingest_reviews(self, rows):
+        """Fold newly arrived review rows into the analytics and republish them.
+
+        With a local index they join the full-corpus statistics; otherwise
+        they are merged into each refresh's sampled figures.
+        """
+        added = self._ensure_corpus().ingest(rows)
+        self._analytics.refresh_now()
+        return added
+
+    def _compute_analytics(self):
+        if self._uses_corpus():
+            return self._analytics_from_corpus()
+        # All four fetches go out at once; the refresh costs one round trip
+        return self._analytics_from_rows(self._fetch_many(self._analytics_queries()))
+
+    def _analytics_from_corpus(self):
+        corpus = self._ensure_corpus()
+        if self.local_index is not None:
+            corpus.update(self.local_index)  # only rows not yet aggregated
+        summary = corpus.summary()
+        trends = {}
+        for category in ANALYTICS_CATEGORIES:
+            stats = summary["categories"][category]
+            if stats["count"]:
+                trends[category] = round(stats["mean_stars"] * 20, 2)  # Convert 5-star to 100
+            else:
+                self.metrics.inc("deepventure_fallback_total", result="analytics")
+                trends[category] = random.uniform(70, 90)
+        text_length = summary["corpus"]["text_length"]
+        return {
+            "market_trends": trends,
+            # Expected value of the old figure (summed length of 50 reviews / 1000)
+            "funding_rounds": int(text_length["mean"] * 50 / 1000) if text_length else 0,
+            "sector_growth": round(np.mean(list(trends.values())) / 10, 2),
+            "category_stats": summary["categories"],
+            "corpus_stats": summary["corpus"],
+        }
+
+    def _analytics_from_rows(self, all_rows):
+        *category_rows, recent_rows = all_rows
+        # Reviews passed to ingest_reviews count alongside the sampled ones
+        ingested = self._corpus.summary()["categories"] if self._corpus is not None else {}
         trends = {}
-        for category in categories:
-            rows = self._fetch_hf_data(category, limit=50)
-            if rows:
-                ratings = [row["row"]["stars"] * 20 for row in rows]
-                trends[category] = round(np.mean(ratings), 2)
+        for category, rows in zip(ANALYTICS_CATEGORIES, category_rows):
+            total = sum(row["row"]["stars"] * 20 for row in rows)
+            count = len(rows)
+            stats = ingested.get(category)
+            if stats and stats["count"]:
+                total += stats["mean_stars"] * 20 * stats["count"]
+                count += stats["count"]
+            if count:
+                trends[category] = round(total / count, 2)
             else:
+                self.metrics.inc("deepventure_fallback_total", result="analytics")
                 trends[category] = random.uniform(70, 90)
         
-        funding_rounds = int(sum(len(row["row"]["text"]) for row in self._fetch_hf_data("", limit=50)) / 1000)
+        funding_rounds = int(sum(len(row["row"]["text"]) for row in recent_rows) / 1000)
         sector_growth = round(np.mean([trends[cat] for cat in trends]) / 10, 2)
 
         return {
@@ -0,0 +1,135 @@
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WORDS = ("great food friendly staff slow service tech app online restaurant clean cheap "
+         "awful pizza delivery booking price quality support fast local business").split()
+
+
+def synthetic_rows(query, limit, offset=0):
+    """Deterministic yelp_review_full-like rows for a query, starting at `offset`"""
+    seed = f"{query}\0{limit}" + (f"\0{offset}" if offset else "")
+    rng = random.Random(zlib.crc32(seed.encode("utf-8")))
+    rows = []
+    for i in range(limit):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 200))]
+        if query.strip():
+            words[rng.randrange(len(words))] = query.split()[0].lower()
+        stars = rng.randint(1, 5)
+        rows.append({"row_idx": offset + i, "row": {"label": stars - 1, "stars": stars, "text": " ".join(words)},
+                     "truncated_cells": []})
+    return rows
+
+
+class FakeDatasetsServer:
+    """Local stand-in for datasets-server's /rows endpoint.
+
+    Adds `latency` (+ uniform `jitter`) seconds to each request and fails a
+    `error_rate` fraction of them with `error_status`. Rows come from a
+    LocalReviewIndex when `index_path` is given, otherwise they are synthetic.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, jitter=0.0, error_rate=0.0,
+                 error_status=500, index_path=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.index = None
+        if index_path:
+            from local_reviews import LocalReviewIndex
+            self.index = LocalReviewIndex(index_path)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/rows"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, request):
+        url = urlparse(request.path)
+        with self._lock:
+            self.counts["requests"] += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.counts["errors"] += 1
+        time.sleep(delay)
+        if url.path != "/rows":
+            status, payload = 404, {"error": "not found"}
+        elif fail:
+            status, payload = self.error_status, {"error": "injected failure"}
+        else:
+            params = parse_qs(url.query)
+            query = params.get("query", [""])[0]
+            limit = int(params.get("limit", ["100"])[0])
+            offset = int(params.get("offset", ["0"])[0])
+            if self.index is not None:
+                rows = self.index.search(query, limit, offset)
+            else:
+                rows = synthetic_rows(query, limit, offset)
+            status, payload = 200, {"rows": rows, "num_rows_total": len(rows), "partial": False}
+        body = json.dumps(payload).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-datasets-server",
+                                        daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for datasets-server /rows")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--index", default=None, help="Serve rows from a local_reviews.py index")
+    args = parser.parse_args()
+    server = FakeDatasetsServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                                args.error_status, args.index)
+    print(f"Serving on {server.url} (set DEEPVENTURE_HF_API_URL to this URL)")
+    server.serve_forever()
@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight wait for and share its result (or exception). Nothing is kept
+    once the call finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Return (value, shared); `shared` is True when another caller's result was reused"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting calls to `rate` per second with bursts of `burst`.
+
+    Callers over the rate queue in arrival order: each takes a reservation on
+    a future token and sleeps until it is due. A caller whose wait would
+    exceed `max_wait` seconds is turned away instead.
+    """
+
+    def __init__(self, rate, burst=1, max_wait=10.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Seconds until a token is available (now reserved), or None if over `max_wait`"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens go negative while callers are queued on future refills
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > self.max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def acquire(self):
+        """Block until a token is available; returns the wait in seconds, or None if rejected"""
+        wait = self.reserve()
+        if wait:
+            with self._lock:
+                self._waiting += 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait
+
+    async def acquire_async(self):
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the thread"""
+        wait = self.reserve()
+        if wait:
+            with self._lock:
+                self._waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait
+
+    @property
+    def waiting(self):
+        """Callers currently queued for a token"""
+        return self._waiting
+
+
+@functools.lru_cache(maxsize=None)
+def shared_bucket(rate, burst=1, max_wait=10.0):
+    """One TokenBucket per configuration for the whole process, shared by every backend"""
+    return TokenBucket(rate, burst, max_wait)
@@ -1,40 +1,103 @@
+import asyncio
+
 import gradio as gr
+from async_backend import AsyncDeepVentureBackend
 from deepventure_backend import DeepVentureBackend
+from history import HistoryStore
+from metrics import profile, serve_from_env
 
 # hugging face api token is confidential so iam not updated in github (Replace with actual token)
 HF_API_TOKEN = "huggingface_token"
+# Queue settings: submissions handled at once, and waiting submissions allowed.
+# Handlers are async, so concurrent submissions share the event loop instead
+# of holding a worker thread each.
+CONCURRENCY_LIMIT = 64
+MAX_QUEUE_SIZE = 512
 backend = DeepVentureBackend(HF_API_TOKEN)
+backend.warm_up(background=True)  # fit models while the UI starts
+backend.start_analytics_refresher()  # every DEEPVENTURE_ANALYTICS_INTERVAL seconds
+# Each in-flight submission holds up to two upstream connections
+async_backend = AsyncDeepVentureBackend(backend, max_connections=2 * CONCURRENCY_LIMIT)
+serve_from_env(backend.metrics)  # /metrics endpoint when DEEPVENTURE_METRICS_PORT is set
 
-# Function to evaluate and simulate the idea
-def evaluate_and_simulate(title, description, session_state):
-    score = backend.evaluate_idea(description)
-    simulation = backend.run_simulation(title, description, score)
-    mentor = backend.match_mentor(description)
-    microlearning = backend.get_microlearning("business")
-    
+PENDING = "_⏳ running..._"
+NO_HISTORY = "No evaluations yet. Submit an idea to see your history!"
+HISTORY_PAGE_SIZE = 5
+
+def format_response(results):
+    """Assistant message for the sections available so far"""
+    response = f"### Evaluation Score: {results['score']}/100\n\n#### Simulation Results:\n"
+    simulation = results.get("simulation")
+    if simulation:
+        response += f"- **Success Rate:** {simulation['success_rate']}%\n" \
+                    f"- **Market Potential:** {simulation['market_potential']}%\n" \
+                    f"- **Risk Factor:** {simulation['risk_factor']}%\n\n"
+    else:
+        response += f"{PENDING}\n\n"
+    response += f"**Recommended Mentor:** {results.get('mentor', PENDING)}\n\n"
+    microlearning = results.get("microlearning")
+    response += f"**Suggested Learning Modules:** {', '.join(microlearning) if microlearning else PENDING}"
+    return response
+
+def render_history_entry(record):
+    """History Markdown for one evaluation, rendered once when it is added"""
+    results = {
+        "score": record.score,
+        "simulation": {"success_rate": record.success_rate, "market_potential": record.market_potential,
+                       "risk_factor": record.risk_factor},
+        "mentor": record.mentor,
+        "microlearning": record.microlearning,
+    }
+    return f"#### Evaluation {record.number}: {record.title}\n" \
+           f"**Description:** {record.description}\n\n" \
+           f"{format_response(results)}\n\n---\n"
+
+def new_session_state():
+    """Per-session state: a bounded history of compact records"""
+    return {"history": HistoryStore(render=render_history_entry)}
+
+def format_profile(profiler):
+    """Hottest functions plus folded stacks (flamegraph input) for one request"""
+    top = "\n".join(f"{share:6.1%}  {function}" for function, share in profiler.top())
+    return f"# Top functions by sample share\n{top}\n\n# Folded stacks\n{profiler.collapsed()}"
+
+def profiled_evaluation(title, description):
+    """Sync evaluation on the calling thread under the sampling profiler"""
+    with profile() as profiler:
+        results = dict(backend.iter_evaluation(title, description))
+    return results, format_profile(profiler)
+
+# Function to evaluate and simulate the idea, streaming each section as it completes
+async def evaluate_and_simulate(title, description, session_state, profile_request=False):
     # Format as a list of two-element lists for Chatbot
     user_message = f"**Title:** {title}\n**Description:** {description}"
-    assistant_response = f"### Evaluation Score: {score}/100\n\n" \
-                        f"#### Simulation Results:\n" \
-                        f"- **Success Rate:** {simulation['success_rate']}%\n" \
-                        f"- **Market Potential:** {simulation['market_potential']}%\n" \
-                        f"- **Risk Factor:** {simulation['risk_factor']}%\n\n" \
-                        f"**Recommended Mentor:** {mentor}\n\n" \
-                        f"**Suggested Learning Modules:** {', '.join(microlearning)}"
-    
-    # Use list of lists instead of list of tuples
-    result_message = [[user_message, assistant_response]]
-    
+    results = {}
+    profile_report = ""
+    if profile_request:
+        # The profiler samples one thread, so a profiled request runs the sync
+        # backend to completion on a worker thread instead of the event loop.
+        results, profile_report = await asyncio.to_thread(profiled_evaluation, title, description)
+        with backend.metrics.timer("deepventure_ui_render_seconds", app="gradio"):
+            result_message = [[user_message, format_response(results)]]
+    else:
+        async for section, value in async_backend.iter_evaluation(title, description):
+            results[section] = value
+            # Use list of lists instead of list of tuples
+            with backend.metrics.timer("deepventure_ui_render_seconds", app="gradio"):
+                result_message = [[user_message, format_response(results)]]
+            yield result_message, session_state, profile_report
+
     # Debug print to verify format
     print("Result message:", result_message)
-    
+
     # Update session state with history
-    session_state["history"].append({"title": title, "description": description, "result": result_message})
-    return result_message, session_state
+    session_state["history"].add(title, description, results["score"], results["simulation"],
+                                 results["mentor"], results["microlearning"])
+    yield result_message, session_state, profile_report
 
 # Function to clear all inputs and reset state
 def clear_inputs():
-    return "", "", {"history": []}, [], "No evaluations yet. Submit an idea to see your history!"
+    return "", "", new_session_state(), [], NO_HISTORY, 0, ""
 
 # Initialize Blocks with a custom theme
 demo = gr.Blocks(
@@ -50,7 +113,8 @@ demo = gr.Blocks(
 
 with demo:
     # Session state to track evaluation history
-    state = gr.State(value={"history": []})
+    state = gr.State(value=new_session_state)
+    history_page = gr.State(value=0)
     
     gr.Markdown("# DeepVenture Hub - Idea Evaluator", elem_classes="header")
     gr.Markdown("Submit your business idea and get AI-powered insights!", elem_classes="subheader")
@@ -89,27 +153,47 @@ with demo:
         # History Tab
         with gr.TabItem("History"):
             with gr.Accordion("Past Evaluations", open=False):
-                history_text = gr.Markdown("No evaluations yet. Submit an idea to see your history!")
+                history_text = gr.Markdown(NO_HISTORY)
+                with gr.Row():
+                    newer = gr.Button("◀ Newer", size="sm")
+                    history_page_label = gr.Markdown("")
+                    older = gr.Button("Older ▶", size="sm")
+
+        # Diagnostics Tab
+        with gr.TabItem("Diagnostics"):
+            profile_toggle = gr.Checkbox(label="Profile my next submissions (sampling profiler)", value=False)
+            profile_output = gr.Code(label="Last request profile", lines=15)
+            refresh_metrics = gr.Button("Refresh Metrics", variant="secondary")
+            metrics_output = gr.Code(label="Backend metrics (Prometheus text format)", lines=20)
+            refresh_metrics.click(fn=backend.metrics_text, inputs=None, outputs=[metrics_output])
 
     # Event handling for submit
-    def update_history(session_state):
-        if not session_state["history"]:
-            return "No evaluations yet. Submit an idea to see your history!"
-        history_md = ""
-        for i, entry in enumerate(session_state["history"], 1):
-            history_md += f"#### Evaluation {i}: {entry['title']}\n" \
-                         f"**Description:** {entry['description']}\n\n" \
-                         f"{entry['result'][0][1]}\n\n---\n"  # Use the assistant response from the list
-        return history_md
+    def update_history(session_state, page=0):
+        """One page of pre-rendered entries (page 0 is the newest), so cost is flat per submit"""
+        history = session_state["history"]
+        if not len(history):
+            return NO_HISTORY, 0, ""
+        pages = history.page_count(HISTORY_PAGE_SIZE)
+        page = min(max(page, 0), pages - 1)
+        label = f"Page {page + 1} of {pages} · {history.total} evaluations this session"
+        return history.render_page(page, HISTORY_PAGE_SIZE), page, label
+
+    history_outputs = [history_text, history_page, history_page_label]
+    newer.click(fn=lambda session_state, page: update_history(session_state, page - 1),
+                inputs=[state, history_page], outputs=history_outputs)
+    older.click(fn=lambda session_state, page: update_history(session_state, page + 1),
+                inputs=[state, history_page], outputs=history_outputs)
 
     submit.click(
         fn=evaluate_and_simulate,
-        inputs=[title, description, state],
-        outputs=[chatbot, state]
+        inputs=[title, description, state, profile_toggle],
+        outputs=[chatbot, state, profile_output],
+        concurrency_limit=CONCURRENCY_LIMIT,
+        api_name="evaluate"  # endpoint driven by loadtest.py
     ).then(
         fn=update_history,
         inputs=[state],
-        outputs=[history_text]
+        outputs=history_outputs
     )
 
     # Clear button with pure Python reset
@@ -118,8 +202,10 @@ with demo:
         clear.click(
             fn=clear_inputs,
             inputs=None,
-            outputs=[title, description, state, chatbot, history_text]
+            outputs=[title, description, state, chatbot, history_text, history_page, history_page_label]
         )
 
+demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=MAX_QUEUE_SIZE)
+
 if __name__ == "__main__":
     demo.launch()
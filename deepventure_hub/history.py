@@ -0,0 +1,74 @@
+import os
+from collections import deque, namedtuple
+
+# Evaluations kept per session; older ones are dropped
+DEFAULT_RETENTION = int(os.environ.get("DEEPVENTURE_HISTORY_RETENTION", 50))
+PAGE_SIZE = 5
+
+HistoryRecord = namedtuple("HistoryRecord", ["number", "title", "description", "score", "success_rate",
+                                             "market_potential", "risk_factor", "mentor", "microlearning",
+                                             "markdown"])
+
+
+def render_markdown(record):
+    """Default Markdown for one history entry"""
+    return (f"#### Evaluation {record.number}: {record.title}\n"
+            f"**Description:** {record.description}\n\n"
+            f"**Score:** {record.score}/100 · **Success Rate:** {record.success_rate}% · "
+            f"**Market Potential:** {record.market_potential}% · **Risk Factor:** {record.risk_factor}%\n\n"
+            f"**Mentor:** {record.mentor} · **Modules:** {', '.join(record.microlearning)}\n\n---\n")
+
+
+class HistoryStore:
+    """Bounded per-session history of compact evaluation records.
+
+    Records keep the scalar results only, and each is rendered to Markdown by
+    `render` once, when it is added. Showing a page joins at most `page_size`
+    pre-rendered strings, so the cost of a submit does not grow with the
+    session. Past `max_entries` the oldest record is dropped; `total` and
+    `average_score` still cover every evaluation in the session.
+    """
+
+    def __init__(self, max_entries=DEFAULT_RETENTION, render=render_markdown):
+        self._records = deque(maxlen=max_entries)
+        self.render = render
+        self.total = 0
+        self._score_sum = 0
+
+    def add(self, title, description, score, simulation, mentor, microlearning):
+        """Record one evaluation; returns the stored HistoryRecord"""
+        self.total += 1
+        self._score_sum += score
+        record = HistoryRecord(self.total, title, description, int(score),
+                               float(simulation["success_rate"]), float(simulation["market_potential"]),
+                               float(simulation["risk_factor"]), mentor, tuple(microlearning), "")
+        record = record._replace(markdown=self.render(record))
+        self._records.append(record)
+        return record
+
+    @property
+    def average_score(self):
+        return self._score_sum / self.total if self.total else None
+
+    def __len__(self):
+        return len(self._records)
+
+    def latest(self):
+        return self._records[-1] if self._records else None
+
+    def page_count(self, page_size=PAGE_SIZE):
+        return max(1, -(-len(self._records) // page_size))
+
+    def page(self, page=0, page_size=PAGE_SIZE):
+        """Records on page `page` (0 is the newest), newest first"""
+        end = len(self._records) - page * page_size
+        start = max(0, end - page_size)
+        return [self._records[i] for i in range(end - 1, start - 1, -1)]
+
+    def render_page(self, page=0, page_size=PAGE_SIZE):
+        return "".join(record.markdown for record in self.page(page, page_size))
+
+    def clear(self):
+        self._records.clear()
+        self.total = 0
+        self._score_sum = 0
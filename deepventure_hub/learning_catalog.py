@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from startup import lazy_import
+
+
+def _module_text(module):
+    return " ".join([module["title"], module.get("category", ""), module.get("summary", "")])
+
+
+class LearningCatalog:
+    """Microlearning modules with O(1) category lookup and TF-IDF top-k search.
+
+    Modules are dicts with "title" and "category" plus optional "id" (defaults
+    to the title) and "summary". When `path` is given (JSON list or JSONL),
+    the file is read on first use and `reload()` picks up edits: only added or
+    changed modules are vectorized, removed ones are masked out. The TF-IDF
+    vocabulary is fitted once; pass `refit=True` to rebuild it.
+    """
+
+    def __init__(self, modules=None, path=None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._modules = None         # id -> module
+        self._by_category = {}       # category -> [titles]
+        self._vectorizer = None
+        self._matrix = None          # rows L2-normalized, aligned with self._row_ids
+        self._row_ids = []
+        if modules is not None:
+            self._set_modules(modules)
+
+    def _read_file(self):
+        with open(self.path) as f:
+            if self.path.endswith(".jsonl"):
+                return [json.loads(line) for line in f if line.strip()]
+            return json.load(f)
+
+    def _ensure_loaded(self):
+        if self._modules is None:
+            with self._lock:
+                if self._modules is None:
+                    self._mtime = os.path.getmtime(self.path)
+                    self._set_modules(self._read_file())
+
+    def _set_modules(self, modules):
+        self._modules = {module.get("id", module["title"]): module for module in modules}
+        by_category = {}
+        for module in self._modules.values():
+            by_category.setdefault(module["category"], []).append(module["title"])
+        self._by_category = by_category
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._modules)
+
+    def category(self, name):
+        """Module titles for an exact category, or None"""
+        self._ensure_loaded()
+        return self._by_category.get(name)
+
+    def _ensure_index(self):
+        if self._matrix is not None:
+            return
+        with self._lock:
+            if self._matrix is None:
+                text = lazy_import("sklearn.feature_extraction.text")
+                vectorizer = text.TfidfVectorizer(stop_words="english")
+                row_ids = list(self._modules)
+                self._matrix = vectorizer.fit_transform(_module_text(self._modules[i]) for i in row_ids)
+                self._vectorizer = vectorizer
+                self._row_ids = row_ids
+
+    def search(self, query, k=5):
+        """Top-k (module, cosine score) pairs for a free-text query, best first"""
+        self._ensure_loaded()
+        if not self._modules:
+            return []
+        self._ensure_index()
+        with self._lock:
+            matrix, row_ids, modules = self._matrix, self._row_ids, self._modules
+            query_vector = self._vectorizer.transform([query])
+        scores = (matrix @ query_vector.T).toarray().ravel()
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(modules[row_ids[i]], float(scores[i])) for i in top if scores[i] > 0]
+
+    def reload(self, refit=False):
+        """Re-read the catalog file if it changed; returns True when anything was reloaded"""
+        if self.path is None:
+            return False
+        with self._lock:
+            mtime = os.path.getmtime(self.path)
+            if self._modules is not None and mtime == self._mtime and not refit:
+                return False
+            old_modules = self._modules or {}
+            self._mtime = mtime
+            self._set_modules(self._read_file())
+            if self._matrix is None or refit:
+                self._matrix = None
+                return True
+            sparse = lazy_import("scipy.sparse")
+            keep = [row for row, module_id in enumerate(self._row_ids)
+                    if old_modules[module_id] == self._modules.get(module_id)]
+            kept_ids = [self._row_ids[row] for row in keep]
+            kept = set(kept_ids)
+            new_ids = [module_id for module_id in self._modules if module_id not in kept]
+            blocks = [self._matrix[keep]]
+            if new_ids:
+                blocks.append(self._vectorizer.transform(_module_text(self._modules[i]) for i in new_ids))
+            self._matrix = sparse.vstack(blocks, format="csr")
+            self._row_ids = kept_ids + new_ids
+            return True
@@ -0,0 +1,283 @@
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from benchmark import SAMPLE_IDEAS
+from fake_datasets_server import FakeDatasetsServer
+
+# api_name of gradio_app.py's submit event
+API_NAME = "/evaluate"
+# A load step adding less than this fraction of throughput over the previous
+# step is past the knee of the curve
+MIN_THROUGHPUT_GAIN = 0.05
+
+
+def load_ideas(path):
+    """(title, description) pairs from a CSV or JSONL file with those columns"""
+    if path is None:
+        return list(SAMPLE_IDEAS)
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    return [(row["title"], row["description"]) for row in rows]
+
+
+class GradioTarget:
+    """Submits ideas to a running gradio_app.py; one client per worker thread"""
+
+    def __init__(self, url):
+        from gradio_client import Client
+        self._client_class = Client
+        self.url = url
+        self._local = threading.local()
+
+    def __call__(self, title, description):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_class(self.url, verbose=False)
+        # Inputs are title, description and the (off) profiling toggle; the
+        # session State input is handled by Gradio
+        return client.predict(title, description, False, api_name=API_NAME)
+
+
+class BackendTarget:
+    """Runs the same evaluation in-process, without Gradio, for comparison"""
+
+    def __init__(self, api_url, use_cache=False):
+        from deepventure_backend import DeepVentureBackend
+        from response_cache import ResponseCache
+        cache = None if use_cache else ResponseCache(max_entries=0)
+        self.backend = DeepVentureBackend("loadtest", api_url=api_url, cache=cache)
+        self.backend.warm_up()
+
+    def __call__(self, title, description):
+        return list(self.backend.iter_evaluation(title, description))
+
+    def close(self):
+        self.backend.close()
+
+
+def run_closed(call, ideas, concurrency, duration, seed=0):
+    """`concurrency` users each submitting back to back for `duration` seconds"""
+    records = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def user(n):
+        rng = random.Random(seed * 1000 + n)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ok = _attempt(call, rng.choice(ideas))
+            with lock:
+                records.append((time.perf_counter() - start, ok))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - started
+
+
+def run_open(call, ideas, rate, duration, max_in_flight=256, seed=0):
+    """Poisson arrivals at `rate` per second for `duration` seconds.
+
+    Latency is measured from each request's scheduled arrival, so time spent
+    waiting for a free client thread counts against the app (no coordinated
+    omission).
+    """
+    rng = random.Random(seed)
+    records = []
+    lock = threading.Lock()
+
+    def submit(scheduled, idea):
+        ok = _attempt(call, idea)
+        with lock:
+            records.append((time.perf_counter() - scheduled, ok))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="loadtest") as pool:
+        scheduled = started
+        while True:
+            scheduled += rng.expovariate(rate)
+            if scheduled - started > duration:
+                break
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+            pool.submit(submit, scheduled, rng.choice(ideas))
+    return records, time.perf_counter() - started
+
+
+def _attempt(call, idea):
+    try:
+        call(*idea)
+        return True
+    except Exception as e:
+        print(f"Request failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return False
+
+
+def summarize_step(level, records, elapsed):
+    """Throughput, error rate and latency percentiles for one load level"""
+    latencies = np.array([latency for latency, ok in records if ok])
+    errors = sum(1 for _, ok in records if not ok)
+    step = {
+        "level": level,
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "throughput_per_s": round(len(latencies) / elapsed, 2),
+    }
+    if len(latencies):
+        p50, p90, p95, p99 = np.percentile(latencies * 1000, [50, 90, 95, 99])
+        step.update(mean_ms=round(float(latencies.mean() * 1000), 1), p50_ms=round(float(p50), 1),
+                    p90_ms=round(float(p90), 1), p95_ms=round(float(p95), 1), p99_ms=round(float(p99), 1))
+    return step
+
+
+def find_saturation(steps, slo_p95_ms, max_error_rate):
+    """Knee of the throughput curve and the highest load level meeting the SLO"""
+    knee = None
+    for previous, step in zip(steps, steps[1:]):
+        if step["throughput_per_s"] < previous["throughput_per_s"] * (1 + MIN_THROUGHPUT_GAIN):
+            knee = previous["level"]
+            break
+    sustainable = [step["level"] for step in steps
+                   if step.get("p95_ms") is not None and step["p95_ms"] <= slo_p95_ms
+                   and step["error_rate"] <= max_error_rate]
+    return {
+        "knee_level": knee,
+        "max_sustainable_level": max(sustainable) if sustainable else None,
+        "peak_throughput_per_s": max((step["throughput_per_s"] for step in steps), default=0.0),
+    }
+
+
+def spawn_app(api_url, port, use_cache=False, timeout=120):
+    """Start gradio_app.py against `api_url` and wait until it answers.
+
+    The response cache is off unless `use_cache` is set, so every request
+    reaches the stand-in rather than being answered from memory.
+    """
+    env = dict(os.environ, DEEPVENTURE_HF_API_URL=api_url, GRADIO_SERVER_PORT=str(port))
+    if not use_cache:
+        env["DEEPVENTURE_CACHE_ENTRIES"] = "0"
+    process = subprocess.Popen([sys.executable, "gradio_app.py"], env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    url = f"http://127.0.0.1:{port}/"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gradio_app.py exited with code {process.returncode}")
+        try:
+            if requests.get(url, timeout=1).ok:
+                return process, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gradio_app.py did not answer on {url} within {timeout}s")
+
+
+def run(target, ideas, mode="closed", levels=(1, 2, 4, 8, 16, 32), duration=30, warmup=5,
+        slo_p95_ms=2000, max_error_rate=0.01, seed=0):
+    """Sweep load levels (users or arrivals/s) and locate the saturation point"""
+    if warmup:
+        run_closed(target, ideas, 1, warmup, seed)
+    steps = []
+    for level in levels:
+        if mode == "closed":
+            records, elapsed = run_closed(target, ideas, int(level), duration, seed)
+        else:
+            records, elapsed = run_open(target, ideas, float(level), duration, seed=seed)
+        steps.append(summarize_step(level, records, elapsed))
+        step = steps[-1]
+        print(f"{mode} {level:>6}: {step['throughput_per_s']:8.2f}/s  p50 {step.get('p50_ms', '-'):>8} ms  "
+              f"p95 {step.get('p95_ms', '-'):>8} ms  errors {step['error_rate']:.1%}", file=sys.stderr)
+    return {"steps": steps, "saturation": find_saturation(steps, slo_p95_ms, max_error_rate)}
+
+
+def write_plot(report, path):
+    """Latency-vs-throughput curve (p50/p95/p99 against achieved throughput) as HTML"""
+    import plotly.graph_objects as go
+
+    steps = [step for step in report["steps"] if "p50_ms" in step]
+    fig = go.Figure()
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        fig.add_trace(go.Scatter(x=[step["throughput_per_s"] for step in steps], y=[step[metric] for step in steps],
+                                 mode="lines+markers", name=metric[:-3],
+                                 text=[f"{report['config']['mode']} level {step['level']}" for step in steps]))
+    fig.update_layout(title="Latency vs throughput", xaxis_title="Completed requests/s",
+                      yaxis_title="Latency (ms)")
+    fig.write_html(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Gradio evaluate endpoint against a local "
+                                                 "datasets-server stand-in")
+    parser.add_argument("--url", default=None, help="Running Gradio app to target (default: spawn gradio_app.py)")
+    parser.add_argument("--target", choices=("gradio", "backend"), default="gradio",
+                        help="'backend' drives DeepVentureBackend in-process to isolate Gradio overhead")
+    parser.add_argument("--port", type=int, default=7861, help="Port for the spawned Gradio app")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed",
+                        help="closed: levels are concurrent users; open: levels are Poisson arrivals/s")
+    parser.add_argument("--levels", type=float, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per load level")
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--ideas", default=None, help="CSV or JSONL file with title/description columns")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in latency per request, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slo-p95-ms", type=float, default=2000)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--output", default="loadtest_results.json")
+    parser.add_argument("--plot", default=None, help="Write the latency-vs-throughput curve to this HTML file")
+    args = parser.parse_args()
+
+    levels = [int(level) if level.is_integer() else level for level in args.levels]
+    ideas = load_ideas(args.ideas)
+    with FakeDatasetsServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            seed=args.seed) as server:
+        process = None
+        if args.target == "backend":
+            target = BackendTarget(server.url, args.cache)
+        else:
+            url = args.url
+            if url is None:
+                process, url = spawn_app(server.url, args.port, args.cache)
+            target = GradioTarget(url)
+        try:
+            report = run(target, ideas, args.mode, levels, args.duration, args.warmup, args.slo_p95_ms,
+                         args.max_error_rate, args.seed)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+            if args.target == "backend":
+                target.close()
+        upstream = dict(server.counts)
+
+    report["config"] = {"target": args.target, "mode": args.mode, "duration": args.duration,
+                        "ideas": len(ideas), "latency": args.latency, "jitter": args.jitter,
+                        "error_rate": args.error_rate, "use_cache": args.cache, "slo_p95_ms": args.slo_p95_ms,
+                        "seed": args.seed}
+    report["upstream"] = upstream
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saturation: {report['saturation']}", file=sys.stderr)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if args.plot:
+        write_plot(report, args.plot)
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+FORMAT_VERSION = 1
+
+
+def tokenize(text):
+    """Lowercase word tokens used by both the index builder and the query path"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class LocalReviewIndex:
+    """Memory-mapped columnar store of yelp_review_full with an inverted text index.
+
+    On-disk layout (one directory):
+        stars.npy            uint8   star rating (1-5) per row
+        text_offsets.npy     int64   n_rows + 1 byte offsets into text.bin
+        text.bin             bytes   concatenated UTF-8 review texts
+        terms.json           list    vocabulary, position == term id
+        postings_offsets.npy int64   n_terms + 1 offsets into postings.npy
+        postings.npy         int32   sorted row ids per term
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.stars = np.load(os.path.join(path, "stars.npy"), mmap_mode="r")
+        self.text_offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode="r")
+        self.text = np.memmap(os.path.join(path, "text.bin"), dtype=np.uint8, mode="r")
+        self.postings_offsets = np.load(os.path.join(path, "postings_offsets.npy"), mmap_mode="r")
+        self.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        with open(os.path.join(path, "terms.json")) as f:
+            self.term_ids = {term: i for i, term in enumerate(json.load(f))}
+
+    def __len__(self):
+        return len(self.stars)
+
+    def term_postings(self, term):
+        """Sorted row ids containing `term` (empty array if unknown)"""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return self.postings[:0]
+        return self.postings[self.postings_offsets[term_id]:self.postings_offsets[term_id + 1]]
+
+    def get_text(self, row_id):
+        start, end = self.text_offsets[row_id], self.text_offsets[row_id + 1]
+        return bytes(self.text[start:end]).decode("utf-8")
+
+    def match(self, query):
+        """Row ids approximately matching `query`.
+
+        Query terms are intersected rarest-first; a term that would empty the
+        result is skipped, so long free-text descriptions still return the rows
+        sharing the most selective words with them.
+        """
+        lists = [self.term_postings(term) for term in set(tokenize(query))]
+        lists = sorted((p for p in lists if len(p)), key=len)
+        if not lists:
+            return self.postings[:0]
+        result = np.asarray(lists[0])
+        for postings in lists[1:]:
+            # Binary-search the (small) running result into the longer list
+            idx = np.searchsorted(postings, result)
+            idx[idx == len(postings)] = 0
+            narrowed = result[postings[idx] == result]
+            if len(narrowed):
+                result = narrowed
+        return result
+
+    def iter_rows(self, start=0, stop=None):
+        """Stream rows in the datasets-server shape, e.g. to feed online training"""
+        for i in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield {"row_idx": i, "row": {"stars": int(self.stars[i]), "text": self.get_text(i)}}
+
+    def search(self, query, limit=5, offset=0):
+        """Return rows in the datasets-server `{"row": {"stars", "text"}}` shape"""
+        if query.strip():
+            row_ids = self.match(query)[offset:offset + limit]
+        else:
+            row_ids = range(min(offset, len(self)), min(offset + limit, len(self)))
+        return [
+            {"row_idx": int(i), "row": {"stars": int(self.stars[i]), "text": self.get_text(i)}}
+            for i in row_ids
+        ]
+
+
+def build_index(out_dir, split="train", max_rows=None, chunk_size=10000):
+    """Convert the yelp_review_full split into a LocalReviewIndex directory"""
+    from datasets import load_dataset
+
+    dataset = load_dataset("yelp_review_full", split=split)
+    if max_rows is not None:
+        dataset = dataset.select(range(min(max_rows, len(dataset))))
+    os.makedirs(out_dir, exist_ok=True)
+
+    n_rows = len(dataset)
+    stars = np.empty(n_rows, dtype=np.uint8)
+    offsets = np.zeros(n_rows + 1, dtype=np.int64)
+    term_ids = {}
+    pair_terms, pair_rows = [], []
+
+    with open(os.path.join(out_dir, "text.bin"), "wb") as text_file:
+        for start in range(0, n_rows, chunk_size):
+            batch = dataset[start:start + chunk_size]
+            chunk_terms, chunk_rows = [], []
+            for j, (label, text) in enumerate(zip(batch["label"], batch["text"])):
+                row_id = start + j
+                encoded = text.encode("utf-8")
+                text_file.write(encoded)
+                stars[row_id] = label + 1  # labels are 0-4
+                offsets[row_id + 1] = offsets[row_id] + len(encoded)
+                for term in set(tokenize(text)):
+                    chunk_terms.append(term_ids.setdefault(term, len(term_ids)))
+                    chunk_rows.append(row_id)
+            pair_terms.append(np.array(chunk_terms, dtype=np.int32))
+            pair_rows.append(np.array(chunk_rows, dtype=np.int32))
+
+    terms = np.concatenate(pair_terms) if pair_terms else np.empty(0, dtype=np.int32)
+    rows = np.concatenate(pair_rows) if pair_rows else np.empty(0, dtype=np.int32)
+    # Rows were appended in increasing order, so a stable sort by term keeps
+    # each posting list sorted by row id.
+    order = np.argsort(terms, kind="stable")
+    postings = rows[order]
+    postings_offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(terms, minlength=len(term_ids)), out=postings_offsets[1:])
+
+    np.save(os.path.join(out_dir, "stars.npy"), stars)
+    np.save(os.path.join(out_dir, "text_offsets.npy"), offsets)
+    np.save(os.path.join(out_dir, "postings.npy"), postings)
+    np.save(os.path.join(out_dir, "postings_offsets.npy"), postings_offsets)
+    vocabulary = sorted(term_ids, key=term_ids.get)
+    with open(os.path.join(out_dir, "terms.json"), "w") as f:
+        json.dump(vocabulary, f)
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump({"format_version": FORMAT_VERSION, "dataset": "yelp_review_full",
+                   "split": split, "n_rows": n_rows, "n_terms": len(term_ids)}, f)
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the offline yelp_review_full index")
+    parser.add_argument("--out", required=True, help="Output directory for the index")
+    parser.add_argument("--split", default="train")
+    parser.add_argument("--max-rows", type=int, default=None)
+    args = parser.parse_args()
+    build_index(args.out, split=args.split, max_rows=args.max_rows)
+    print(f"Index written to {args.out}")
@@ -0,0 +1,155 @@
+import json
+import math
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from local_reviews import tokenize
+from startup import lazy_import
+
+# Shortest prefix tried when a description word isn't indexed as-is, so
+# "restaurants" or "technology" still reach "restaurant" and "tech".
+MIN_PREFIX = 4
+# Scores this close to the best count as tied with it
+TIE_TOLERANCE = 1e-9
+
+# term -> matrix row, (n_terms x n_mentors) CSR of tf / norm, idf by row, and
+# mentor ids and profiles by column
+_Matrix = namedtuple("_Matrix", ["vocabulary", "weights", "idf", "mentor_ids", "profiles"])
+
+
+class MentorIndex:
+    """Keyword index over mentor profiles with TF-IDF ranking.
+
+    A profile is a dict with "name" and "category" plus optional "keywords"
+    (list) and "bio" (text). Scoring is the cosine-style dot product of the
+    description's and the profile's TF-IDF term weights. Profiles are kept
+    in a sparse term x mentor matrix, so a query only reads the rows of the
+    terms it contains and the dot products and top-k selection run in
+    NumPy/SciPy. Adding or removing a mentor marks the matrix stale; it is
+    rebuilt on the next search.
+    """
+
+    def __init__(self, profiles=()):
+        self._profiles = {}   # mentor_id -> profile
+        self._terms = {}      # mentor_id -> Counter(term -> tf)
+        self._norms = {}      # mentor_id -> sqrt(sum tf^2)
+        self._next_id = 0
+        self._matrix = None   # _Matrix, rebuilt after add/remove
+        self._lock = threading.RLock()
+        for profile in profiles:
+            self.add(profile)
+
+    @classmethod
+    def from_jsonl(cls, path):
+        """Build an index from a file with one JSON mentor profile per line"""
+        with open(path) as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def __len__(self):
+        return len(self._profiles)
+
+    @staticmethod
+    def _profile_terms(profile):
+        text = " ".join([profile.get("category", ""), " ".join(profile.get("keywords", ())),
+                         profile.get("bio", "")])
+        return Counter(tokenize(text))
+
+    def add(self, profile):
+        """Index one mentor profile; returns its mentor id"""
+        terms = self._profile_terms(profile)
+        with self._lock:
+            mentor_id = self._next_id
+            self._next_id += 1
+            self._profiles[mentor_id] = profile
+            self._terms[mentor_id] = terms
+            self._norms[mentor_id] = math.sqrt(sum(tf * tf for tf in terms.values())) or 1.0
+            self._matrix = None
+        return mentor_id
+
+    def remove(self, mentor_id):
+        """Drop a mentor from the index"""
+        with self._lock:
+            self._profiles.pop(mentor_id)
+            self._norms.pop(mentor_id)
+            self._terms.pop(mentor_id)
+            self._matrix = None
+
+    def get(self, mentor_id):
+        return self._profiles[mentor_id]
+
+    def _ensure_matrix(self):
+        """The current _Matrix, rebuilding it from the profiles if it is stale"""
+        with self._lock:
+            if self._matrix is not None:
+                return self._matrix
+            sparse = lazy_import("scipy.sparse")
+            mentor_ids = np.fromiter(self._terms, dtype=np.int64, count=len(self._terms))
+            vocabulary, rows, cols, values = {}, [], [], []
+            for col, mentor_id in enumerate(mentor_ids.tolist()):
+                norm = self._norms[mentor_id]
+                for term, tf in self._terms[mentor_id].items():
+                    rows.append(vocabulary.setdefault(term, len(vocabulary)))
+                    cols.append(col)
+                    values.append(tf / norm)
+            weights = sparse.csr_matrix((values, (rows, cols)), shape=(len(vocabulary), len(mentor_ids)))
+            df = np.diff(weights.indptr)
+            idf = np.log((1 + len(mentor_ids)) / (1 + df)) + 1
+            profiles = [self._profiles[mentor_id] for mentor_id in mentor_ids.tolist()]
+            self._matrix = _Matrix(vocabulary, weights, idf, mentor_ids, profiles)
+            return self._matrix
+
+    @staticmethod
+    def _query_terms(description, vocabulary):
+        """(term rows, query tf) for the description words found in `vocabulary`"""
+        query = Counter()
+        for token in tokenize(description):
+            if token in vocabulary:
+                query[vocabulary[token]] += 1
+                continue
+            for end in range(len(token) - 1, MIN_PREFIX - 1, -1):
+                if token[:end] in vocabulary:
+                    query[vocabulary[token[:end]]] += 1
+                    break
+        return np.fromiter(query.keys(), dtype=np.int64), np.fromiter(query.values(), dtype=float)
+
+    def _scores(self, matrix, description):
+        """Score of every mentor (by matrix column) for a description"""
+        rows, tf = self._query_terms(description, matrix.vocabulary)
+        if not len(rows):
+            return None
+        idf = matrix.idf[rows]
+        return np.asarray((tf * idf * idf) @ matrix.weights[rows]).ravel()
+
+    @staticmethod
+    def _results(matrix, scores, columns):
+        return [(int(matrix.mentor_ids[col]), matrix.profiles[col], float(scores[col])) for col in columns]
+
+    def search(self, description, k=5):
+        """Top-k (mentor_id, profile, score) tuples for a description, best first"""
+        matrix = self._ensure_matrix()
+        scores = self._scores(matrix, description)
+        if scores is None or k <= 0:
+            return []
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # Highest score first, ties by mentor id
+        candidates = candidates[np.lexsort((matrix.mentor_ids[candidates], -scores[candidates]))]
+        return self._results(matrix, scores, candidates)
+
+    def search_best(self, description):
+        """Every (mentor_id, profile, score) tied at the top score, or [] if nothing matches"""
+        matrix = self._ensure_matrix()
+        scores = self._scores(matrix, description)
+        if scores is None:
+            return []
+        best = scores.max()
+        if best <= 0:
+            return []
+        return self._results(matrix, scores, np.flatnonzero(scores >= best - TIE_TOLERANCE))
+
+    def search_batch(self, descriptions, k=5):
+        """search() for each description"""
+        return [self.search(description, k) for description in descriptions]
@@ -0,0 +1,264 @@
+import collections
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms with Prometheus text output.
+
+    Metrics are identified by name plus keyword labels. Collectors are
+    callables returning {(name, labels_tuple): value} gauges evaluated at read
+    time, for values owned elsewhere (e.g. cache counters).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = collections.defaultdict(float)
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the wall time of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def _gauge_items(self):
+        gauges = dict(self._gauges)
+        for collector in self._collectors:
+            gauges.update(collector())
+        return gauges
+
+    def snapshot(self):
+        """In-process view: counters, gauges and histogram summaries keyed by 'name{labels}'"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (h.count, h.sum, list(h.counts), h.buckets) for key, h in self._histograms.items()}
+        return {
+            "counters": {_series(*key): value for key, value in counters.items()},
+            "gauges": {_series(*key): value for key, value in self._gauge_items().items()},
+            "histograms": {
+                _series(*key): {"count": count, "sum": round(total, 6),
+                                "mean": round(total / count, 6) if count else 0.0,
+                                "p50": _quantile(buckets, counts, 0.5), "p95": _quantile(buckets, counts, 0.95),
+                                "p99": _quantile(buckets, counts, 0.99)}
+                for key, (count, total, counts, buckets) in histograms.items()
+            },
+        }
+
+    def render_prometheus(self):
+        """Metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(h.counts), h.sum, h.count, h.buckets))
+                                for key, h in self._histograms.items())
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{_series(name, labels)} {value:g}")
+        for (name, labels), value in sorted(self._gauge_items().items()):
+            header(name, "gauge")
+            lines.append(f"{_series(name, labels)} {value:g}")
+        for (name, labels), (counts, total, count, buckets) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{_series(name + '_bucket', labels + (('le', le),))} {cumulative}")
+            lines.append(f"{_series(name + '_sum', labels)} {total:g}")
+            lines.append(f"{_series(name + '_count', labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _series(name, labels):
+    if not labels:
+        return name
+    body = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+    return f"{name}{{{body}}}"
+
+
+def _quantile(buckets, counts, q):
+    """Upper bucket bound containing quantile q (None if empty)"""
+    total = sum(counts)
+    if not total:
+        return None
+    running = 0
+    for bound, count in zip(buckets + (float("inf"),), counts):
+        running += count
+        if running >= q * total:
+            return bound
+    return float("inf")
+
+
+def instrumented(method):
+    """Record a backend method's latency as deepventure_method_seconds{method=...}"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.timer("deepventure_method_seconds", method=method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def serve(registry, port, host="0.0.0.0"):
+    """Expose `registry` at http://host:port/metrics from a daemon thread.
+
+    One server per port; serving again on a port swaps in the new registry
+    (e.g. after a backend reload).
+    """
+    with _servers_lock:
+        if port in _servers:
+            _servers[port].registry = registry
+            return _servers[port]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = self.server.registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        server.registry = registry
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _servers[port] = server
+        return server
+
+
+def serve_from_env(registry):
+    """Start the /metrics endpoint when DEEPVENTURE_METRICS_PORT is set"""
+    port = os.environ.get("DEEPVENTURE_METRICS_PORT")
+    return serve(registry, int(port)) if port else None
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    `collapsed()` returns stacks in the folded "outer;inner count" format read
+    by flamegraph tools; `top()` lists the functions most often on-CPU.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def top(self, n=15):
+        """(function, share of samples) for the innermost frames seen most often"""
+        leaves = collections.Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [(function, round(count / total, 3)) for function, count in leaves.most_common(n)]
+
+
+@contextmanager
+def profile(interval=0.005, enabled=True):
+    """Sample the current thread for the duration of the block; yields the profiler (or None)"""
+    if not enabled:
+        yield None
+        return
+    profiler = SamplingProfiler(interval=interval).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
@@ -1,18 +1,14 @@
 import streamlit as st
-from deepventure_backend import DeepVentureBackend  # Assuming this is a custom backend
+from shared_backend import get_backend
+import atexit
 import time
 import random
 import pandas as pd
 import plotly.express as px
 from typing import List
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from PIL import Image as PILImage, ImageDraw, ImageFont
-import io
-import uuid
+from certificates import CertificateStore
+from progress_store import ProgressStore
 
 # Hardcoded credentials for demonstration
 VALID_CREDENTIALS = {
@@ -23,7 +19,6 @@ VALID_CREDENTIALS = {
 
 # Initialize backend with Hugging Face API token
 HF_API_TOKEN = "hugging_face"  # Replace with your actual token securely
-backend = DeepVentureBackend(HF_API_TOKEN)
 
 # Set page configuration for a modern dashboard
 st.set_page_config(
@@ -33,11 +28,120 @@ st.set_page_config(
     page_icon="🚀"
 )
 
+# Built once per server process and shared across reruns and sessions
+backend = get_backend(HF_API_TOKEN)
+
 # Cache microlearning data
 @st.cache_data
 def fetch_microlearning(category: str) -> List[str]:
     return backend.get_microlearning(category.lower())
 
+# One certificate per (name, category) per process; fonts and page styles load once
+@st.cache_resource(show_spinner=False)
+def get_certificate_store() -> CertificateStore:
+    return CertificateStore()
+
+certificate_store = get_certificate_store()
+
+# Progress, quiz history, badges and scores survive logout and restarts;
+# DEEPVENTURE_PROGRESS_DB sets the SQLite file
+@st.cache_resource(show_spinner=False)
+def get_progress_store() -> ProgressStore:
+    store = ProgressStore()
+    atexit.register(store.close)
+    return store
+
+progress_store = get_progress_store()
+LEADERBOARD_SIZE = 10
+# Seconds between leaderboard refreshes; other users' scores show up without a full rerun
+LEADERBOARD_REFRESH = 15
+
+# Figures are rebuilt only when their input data changes
+@st.cache_data(max_entries=256, show_spinner=False)
+def progress_figure(total_modules: int, completed: tuple):
+    return px.bar(x=[f"Module {i+1}" for i in range(total_modules)],
+                  y=[1 if f"module_{i+1}" in completed else 0 for i in range(total_modules)],
+                  color=["Completed" if f"module_{i+1}" in completed else "Pending" for i in range(total_modules)])
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def leaderboard_figure(top_users: tuple):
+    leaderboard_df = pd.DataFrame(list(top_users), columns=["User", "Score"])
+    return px.bar(leaderboard_df, x="User", y="Score", color="Score", color_continuous_scale="Viridis")
+
+@st.fragment(run_every=1)
+def certificate_downloads_pending(cert):
+    # Poll the background renderer; a full rerun swaps in the download buttons
+    if certificate_store.is_rendered(cert):
+        st.rerun()
+    st.caption("⏳ Preparing your certificate files...")
+
+@st.fragment
+def modules_and_progress(category):
+    # "Mark Complete" reruns only this fragment; progress is drawn after the
+    # buttons, so it already reflects the click
+    progress = st.session_state.user_data["progress"][category]
+    st.subheader("📚 Modules")
+    for i, module in enumerate(progress["modules"], 1):
+        with st.expander(f"Module {i}: {module[:30]}..."):
+            st.markdown(module)
+            done = f"module_{i}" in progress["completed"]
+            if st.button("Completed ✅" if done else "Mark Complete", key=f"complete_{i}_{category}", disabled=done):
+                completed_at = time.time()
+                progress["completed"][f"module_{i}"] = completed_at
+                progress_store.complete_module(st.session_state.username, category, f"module_{i}", completed_at)
+                if len(progress["completed"]) == progress["total_modules"]:
+                    badge = f"{category.capitalize()} Master - {datetime.now().strftime('%Y-%m-%d')}"
+                    if badge not in st.session_state.user_data["badges"]:
+                        st.session_state.user_data["badges"].append(badge)
+                        progress_store.award_badge(st.session_state.username, badge)
+                    # Badges and the certificate live outside this fragment
+                    st.rerun()
+                st.rerun(scope="fragment")
+
+    st.subheader("📊 Progress")
+    st.metric("Completion", f"{len(progress['completed'])}/{progress['total_modules']}")
+    if progress["completed"]:
+        st.plotly_chart(progress_figure(progress["total_modules"], tuple(sorted(progress["completed"]))),
+                        use_container_width=True)
+
+@st.fragment
+def quiz(category):
+    # The question is kept in session state so it stays put until "Next question"
+    questions = QUIZ_QUESTIONS[category]
+    quiz_state = st.session_state.setdefault("quiz_state", {})
+    entry = quiz_state.setdefault(category, {"index": random.randrange(len(questions)), "correct": None})
+    question = questions[entry["index"]]
+    st.write(question["question"])
+    answer = st.radio("Options", question["options"], key=f"quiz_{category}_{entry['index']}",
+                      disabled=entry["correct"] is not None)
+    if entry["correct"] is None:
+        if st.button("Submit", key=f"quiz_submit_{category}"):
+            is_correct = answer == question["correct_answer"]
+            st.session_state.user_data["quiz_history"].append({"category": category, "correct": is_correct})
+            progress_store.record_quiz(st.session_state.username, category, is_correct)
+            if is_correct:
+                st.session_state.user_data["score"] = progress_store.add_score(st.session_state.username, 100)
+            entry["correct"] = is_correct
+            st.rerun(scope="fragment")
+    else:
+        st.success(f"{'Correct!' if entry['correct'] else 'Incorrect.'} Answer: {question['correct_answer']}")
+        if st.button("Next question", key=f"quiz_next_{category}"):
+            others = [i for i in range(len(questions)) if i != entry["index"]] or [entry["index"]]
+            quiz_state[category] = {"index": random.choice(others), "correct": None}
+            st.rerun(scope="fragment")
+
+@st.fragment(run_every=LEADERBOARD_REFRESH)
+def leaderboard():
+    st.subheader("🏅 Leaderboard")
+    top_users = progress_store.leaderboard(LEADERBOARD_SIZE)
+    if top_users:
+        st.plotly_chart(leaderboard_figure(tuple(top_users)), use_container_width=True)
+    standing = progress_store.rank(st.session_state.username)
+    if standing:
+        st.caption(f"Your rank: #{standing[0]} with {standing[1]} points")
+    else:
+        st.caption("Answer a quiz correctly to join the leaderboard!")
+
 # Initialize session state
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
@@ -46,7 +150,7 @@ if "logged_in" not in st.session_state:
         "progress": {},
         "quiz_history": [],
         "badges": [],
-        "leaderboard": {},
+        "score": 0,
         "last_activity": time.time(),
         "certificate_name": ""
     }
@@ -138,61 +242,13 @@ def login():
                 if username in VALID_CREDENTIALS and VALID_CREDENTIALS[username] == password:
                     st.session_state.logged_in = True
                     st.session_state.username = username
-                    st.session_state.user_data["certificate_name"] = username
+                    # One indexed read per login restores everything saved for the user
+                    st.session_state.user_data = progress_store.load_user(username)
+                    st.session_state.pop("last_category", None)
                     st.rerun()
                 else:
                     st.error("Invalid credentials. Please try again.")
 
-# Certificate generation function
-def generate_certificate(name: str, category: str) -> tuple:
-    credential_id = str(uuid.uuid4())[:8].upper()
-    date = datetime.now().strftime('%Y-%m-%d')
-    
-    # PDF Certificate
-    pdf_buffer = io.BytesIO()
-    doc = SimpleDocTemplate(pdf_buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    styles['Title'].textColor = colors.purple  # Changed from darkpurple to purple
-    styles['BodyText'].fontSize = 14
-    story = [
-        Paragraph("Certificate of Completion", styles['Title']),
-        Spacer(1, 36),
-        Paragraph(f"Awarded to: {name}", styles['BodyText']),
-        Paragraph(f"For successfully completing the {category.capitalize()} Microlearning Module", styles['BodyText']),
-        Paragraph(f"Date: {date}", styles['BodyText']),
-        Paragraph(f"Credential ID: {credential_id}", styles['BodyText']),
-        Spacer(1, 24),
-        Paragraph("Provided by DeepVision", styles['BodyText']),
-    ]
-    doc.build(story)
-    pdf_data = pdf_buffer.getvalue()
-    pdf_buffer.close()
-
-    # PNG Certificate
-    png_width, png_height = 800, 600
-    png_image = PILImage.new('RGB', (png_width, png_height), color='#ffffff')
-    draw = ImageDraw.Draw(png_image)
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 40)
-        text_font = ImageFont.truetype("arial.ttf", 20)
-    except:
-        title_font = ImageFont.load_default()
-        text_font = ImageFont.load_default()
-    
-    draw.text((50, 50), "Certificate of Completion", fill='#800080', font=title_font)  # Using hex code for purple
-    draw.text((50, 150), f"Awarded to: {name}", fill='black', font=text_font)
-    draw.text((50, 200), f"For: {category.capitalize()} Module", fill='black', font=text_font)
-    draw.text((50, 250), f"Date: {date}", fill='black', font=text_font)
-    draw.text((50, 300), f"Credential ID: {credential_id}", fill='black', font=text_font)
-    draw.text((50, 400), "Provided by DeepVision", fill='#800080', font=text_font)
-    
-    png_buffer = io.BytesIO()
-    png_image.save(png_buffer, format="PNG")
-    png_data = png_buffer.getvalue()
-    png_buffer.close()
-    
-    return pdf_data, png_data, credential_id
-
 # Main application
 if not st.session_state.logged_in:
     login()
@@ -203,18 +259,20 @@ else:
         if st.button("Logout", key="logout_btn"):
             st.session_state.logged_in = False
             st.session_state.username = ""
-            st.session_state.user_data = {"progress": {}, "quiz_history": [], "badges": [], "leaderboard": {}, "last_activity": time.time(), "certificate_name": ""}
+            st.session_state.user_data = {"progress": {}, "quiz_history": [], "badges": [], "score": 0, "last_activity": time.time(), "certificate_name": ""}
             st.rerun()
         
         st.subheader("⚙️ Settings")
         certificate_name = st.text_input("Certificate Name", value=st.session_state.user_data["certificate_name"], key="cert_name")
-        if certificate_name.strip():
+        if certificate_name.strip() and certificate_name.strip() != st.session_state.user_data["certificate_name"]:
             st.session_state.user_data["certificate_name"] = certificate_name.strip()
+            progress_store.set_certificate_name(st.session_state.username, certificate_name.strip())
         
         category_options = ["business", "marketing", "finance", "custom"]
         selected_category = st.selectbox("Learning Path", options=category_options, key="category_select")
         custom_input = st.text_input("Custom Idea", disabled=selected_category != "custom", key="custom_input")
-        st.button("Refresh Modules", key="refresh_btn")
+        if st.button("Refresh Modules", key="refresh_btn") and backend.reload_catalog():
+            fetch_microlearning.clear()
 
     # Main content
     st.title("DeepVenture Microlearning Hub")
@@ -229,49 +287,23 @@ else:
                     modules = fetch_microlearning(category)
                     if not modules:
                         modules = ["No modules available. Try another category."]
+                    # Completed modules saved in an earlier session are kept
+                    saved = st.session_state.user_data["progress"].get(category, {})
                     st.session_state.user_data["progress"][category] = {
                         "modules": modules,
-                        "completed": {},
+                        "completed": saved.get("completed", {}),
                         "total_modules": len(modules),
                         "last_accessed": time.time()
                     }
+                    progress_store.save_progress(st.session_state.username, category, modules)
                     st.session_state.last_category = category
-            
-            st.subheader("📚 Modules")
-            for i, module in enumerate(st.session_state.user_data["progress"][category]["modules"], 1):
-                with st.expander(f"Module {i}: {module[:30]}..."):
-                    st.markdown(module)
-                    if st.button(f"Mark Complete", key=f"complete_{i}_{category}"):
-                        st.session_state.user_data["progress"][category]["completed"][f"module_{i}"] = time.time()
-                        if len(st.session_state.user_data["progress"][category]["completed"]) == st.session_state.user_data["progress"][category]["total_modules"]:
-                            badge = f"{category.capitalize()} Master - {datetime.now().strftime('%Y-%m-%d')}"
-                            if badge not in st.session_state.user_data["badges"]:
-                                st.session_state.user_data["badges"].append(badge)
-                        st.rerun()
 
-            # Progress
-            progress = st.session_state.user_data["progress"][category]
-            st.subheader("📊 Progress")
-            st.metric("Completion", f"{len(progress['completed'])}/{progress['total_modules']}")
-            if progress["completed"]:
-                fig = px.bar(x=[f"Module {i+1}" for i in range(progress['total_modules'])], 
-                            y=[1 if f"module_{i+1}" in progress['completed'] else 0 for i in range(progress['total_modules'])],
-                            color=["Completed" if f"module_{i+1}" in progress['completed'] else "Pending" for i in range(progress['total_modules'])])
-                st.plotly_chart(fig, use_container_width=True)
+            modules_and_progress(category)
 
             # Quiz
             if category in QUIZ_QUESTIONS:
                 with st.expander("🎯 Quiz"):
-                    quiz = random.choice(QUIZ_QUESTIONS[category])
-                    st.write(quiz["question"])
-                    answer = st.radio("Options", quiz["options"], key=f"quiz_{category}")
-                    if st.button("Submit", key=f"quiz_submit_{category}"):
-                        is_correct = answer == quiz["correct_answer"]
-                        st.session_state.user_data["quiz_history"].append({"category": category, "correct": is_correct})
-                        if is_correct:
-                            st.session_state.user_data["leaderboard"][st.session_state.username] = st.session_state.user_data["leaderboard"].get(st.session_state.username, 0) + 100
-                        st.success(f"{'Correct!' if is_correct else 'Incorrect.'} Answer: {quiz['correct_answer']}")
-                        st.rerun()
+                    quiz(category)
 
     with col2:
         st.subheader("🏆 Achievements")
@@ -279,14 +311,18 @@ else:
             st.markdown(f"🎖️ **{badge}**")
         
         if category in st.session_state.user_data["progress"] and len(st.session_state.user_data["progress"][category]["completed"]) >= st.session_state.user_data["progress"][category]["total_modules"]:
-            pdf_data, png_data, credential_id = generate_certificate(st.session_state.user_data["certificate_name"], category)
+            cert = certificate_store.issue(st.session_state.user_data["certificate_name"], category)
+            certificate_store.render_async(cert)
+            credential_id = cert.credential_id
             st.success(f"🎉 Course Completed! Credential ID: {credential_id}")
-            st.download_button("Download PDF Certificate", pdf_data, f"certificate_{category}_{credential_id}.pdf", "application/pdf")
-            st.download_button("Download PNG Certificate", png_data, f"certificate_{category}_{credential_id}.png", "image/png")
+            if certificate_store.is_rendered(cert):
+                pdf_data, png_data = certificate_store.files(cert)
+                st.download_button("Download PDF Certificate", pdf_data, f"certificate_{category}_{credential_id}.pdf", "application/pdf")
+                st.download_button("Download PNG Certificate", png_data, f"certificate_{category}_{credential_id}.png", "image/png")
+            else:
+                certificate_downloads_pending(cert)
 
-        st.subheader("🏅 Leaderboard")
-        leaderboard_df = pd.DataFrame([(st.session_state.username, st.session_state.user_data["leaderboard"].get(st.session_state.username, 0))], columns=["User", "Score"])
-        st.plotly_chart(px.bar(leaderboard_df, x="User", y="Score", color="Score", color_continuous_scale="Viridis"), use_container_width=True)
+        leaderboard()
 
     st.markdown("---")
     st.caption("Powered by DeepVision | © 2025 Vikhram S Team DeepVision")
@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from simulation_net import SimulationNet
+from startup import lazy_import
+
+LATEST_FILE = "LATEST"
+FORMAT_VERSION = 1
+
+
+def resolve(model_dir, version=None):
+    """Directory of the requested (or latest) artifact version, or None if absent"""
+    if not model_dir or not os.path.isdir(model_dir):
+        return None
+    if version is None:
+        latest = os.path.join(model_dir, LATEST_FILE)
+        if not os.path.exists(latest):
+            return None
+        with open(latest) as f:
+            version = f.read().strip()
+    path = os.path.join(model_dir, version)
+    return path if os.path.exists(os.path.join(path, "meta.json")) else None
+
+
+def train(index_path, model_dir, version=None, max_rows=None, max_features=1000, simulation_net=None):
+    """Fit the evaluation model on a local review index and write a versioned artifact.
+
+    Targets are star ratings scaled to 0-100, the same scale evaluate_idea
+    blends with. Returns the artifact directory.
+    """
+    from local_reviews import LocalReviewIndex
+
+    text = lazy_import("sklearn.feature_extraction.text")
+    linear_model = lazy_import("sklearn.linear_model")
+    index = LocalReviewIndex(index_path)
+    n_rows = len(index) if max_rows is None else min(max_rows, len(index))
+
+    vectorizer = text.TfidfVectorizer(max_features=max_features)
+    X = vectorizer.fit_transform(index.get_text(i) for i in range(n_rows))
+    y = np.asarray(index.stars[:n_rows], dtype=float) * 20
+    model = linear_model.LinearRegression().fit(X, y)
+    if simulation_net is None:
+        simulation_net = SimulationNet.initialize()
+
+    version = version or time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(model_dir, version)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "vocabulary.json"), "w") as f:
+        json.dump(vectorizer.get_feature_names_out().tolist(), f)
+    np.save(os.path.join(path, "idf.npy"), vectorizer.idf_)
+    np.save(os.path.join(path, "coef.npy"), model.coef_)
+    save_simulation_weights(path, simulation_net.weights)
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"format_version": FORMAT_VERSION, "version": version, "trained_at": time.time(),
+                   "corpus": os.path.abspath(index_path), "n_rows": n_rows,
+                   "n_features": len(model.coef_), "intercept": float(model.intercept_),
+                   "simulation_layers": len(simulation_net.weights)}, f)
+    with open(os.path.join(model_dir, LATEST_FILE), "w") as f:
+        f.write(version)
+    return path
+
+
+def load_evaluator(path):
+    """(vectorizer, model) rebuilt from an artifact; coefficient arrays are memory-mapped"""
+    text = lazy_import("sklearn.feature_extraction.text")
+    linear_model = lazy_import("sklearn.linear_model")
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    with open(os.path.join(path, "vocabulary.json")) as f:
+        vectorizer = text.TfidfVectorizer(vocabulary=json.load(f))
+    vectorizer.idf_ = np.load(os.path.join(path, "idf.npy"), mmap_mode="r")
+    model = linear_model.LinearRegression()
+    model.coef_ = np.load(os.path.join(path, "coef.npy"), mmap_mode="r")
+    model.intercept_ = meta["intercept"]
+    model.n_features_in_ = meta["n_features"]
+    return vectorizer, model
+
+
+def save_simulation_weights(path, weights):
+    """Save weights as float32 so load_simulation_net memory-maps them without a copy"""
+    for i, w in enumerate(weights):
+        np.save(os.path.join(path, f"simulation_{i}.npy"), np.asarray(w, dtype=np.float32))
+
+
+def load_simulation_net(path):
+    with open(os.path.join(path, "meta.json")) as f:
+        n_layers = json.load(f)["simulation_layers"]
+    return SimulationNet([np.load(os.path.join(path, f"simulation_{i}.npy"), mmap_mode="r")
+                          for i in range(n_layers)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and version DeepVenture model artifacts")
+    parser.add_argument("--index", required=True, help="Local review index built by local_reviews.py")
+    parser.add_argument("--out", default="models", help="Artifact root directory")
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--max-features", type=int, default=1000)
+    args = parser.parse_args()
+    path = train(args.index, args.out, version=args.version, max_rows=args.max_rows,
+                 max_features=args.max_features)
+    print(f"Artifacts written to {path}")
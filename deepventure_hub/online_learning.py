@@ -0,0 +1,64 @@
+import copy
+import itertools
+import threading
+
+import numpy as np
+
+from startup import lazy_import
+
+
+class OnlineEvaluator:
+    """Incrementally trained idea evaluator: hashing features + SGD regression.
+
+    The hashing featurizer is stateless, so there is no vocabulary to refit,
+    and each mini-batch costs the same regardless of how many rows came
+    before. Targets are centered on their running mean, because SGD barely
+    moves the intercept on sparse input. Updates are applied to a copy of the
+    regressor and published together with the mean in a single reference
+    assignment, so readers never block on or observe a half-applied update.
+    """
+
+    def __init__(self, n_features=2 ** 18, batch_size=256, **sgd_params):
+        text = lazy_import("sklearn.feature_extraction.text")
+        self._linear_model = lazy_import("sklearn.linear_model")
+        self.vectorizer = text.HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
+        self.batch_size = batch_size
+        self.sgd_params = sgd_params
+        self.n_seen = 0
+        self._state = None  # (regressor, target mean), replaced wholesale
+        self._update_lock = threading.Lock()  # one writer at a time
+
+    @property
+    def ready(self):
+        return self._state is not None
+
+    def partial_fit(self, texts, scores):
+        """Fold one mini-batch of (text, 0-100 score) pairs into the model"""
+        X = self.vectorizer.transform(texts)
+        y = np.asarray(scores, dtype=float) / 100
+        with self._update_lock:
+            if self._state is None:
+                model, mean = self._linear_model.SGDRegressor(**self.sgd_params), 0.0
+            else:
+                model, mean = copy.deepcopy(self._state[0]), self._state[1]
+            n_seen = self.n_seen + len(y)
+            mean += (y.sum() - len(y) * mean) / n_seen
+            model.partial_fit(X, y - mean)
+            self._state = (model, mean)
+            self.n_seen = n_seen
+
+    def ingest_rows(self, rows):
+        """Train on datasets-server shaped rows, in mini-batches of `batch_size`"""
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.partial_fit([row["row"]["text"] for row in batch],
+                             [row["row"]["stars"] * 20 for row in batch])
+        return self.n_seen
+
+    def predict(self, texts):
+        """0-100 scores for each text"""
+        model, mean = self._state
+        return (model.predict(self.vectorizer.transform(texts)) + mean) * 100
@@ -0,0 +1,387 @@
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get("DEEPVENTURE_PROGRESS_DB", "deepventure_progress.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    score INTEGER NOT NULL DEFAULT 0,
+    certificate_name TEXT,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS users_by_score ON users (score DESC);
+CREATE TABLE IF NOT EXISTS progress (
+    username TEXT NOT NULL,
+    category TEXT NOT NULL,
+    modules TEXT NOT NULL,
+    last_accessed REAL NOT NULL,
+    PRIMARY KEY (username, category)
+);
+CREATE TABLE IF NOT EXISTS completions (
+    username TEXT NOT NULL,
+    category TEXT NOT NULL,
+    module TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (username, category, module)
+);
+CREATE TABLE IF NOT EXISTS quiz_history (
+    username TEXT NOT NULL,
+    category TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quiz_history_by_user ON quiz_history (username, answered_at);
+CREATE TABLE IF NOT EXISTS badges (
+    username TEXT NOT NULL,
+    badge TEXT NOT NULL,
+    awarded_at REAL NOT NULL,
+    PRIMARY KEY (username, badge)
+);
+"""
+
+ADD_SCORE = ("INSERT INTO users (username, score, version) "
+             "VALUES (?, ?, (SELECT COALESCE(MAX(version), 0) + 1 FROM users)) "
+             "ON CONFLICT (username) DO UPDATE SET score = score + excluded.score, version = excluded.version")
+SET_CERTIFICATE_NAME = ("INSERT INTO users (username, certificate_name) VALUES (?, ?) "
+                        "ON CONFLICT (username) DO UPDATE SET certificate_name = excluded.certificate_name")
+SAVE_PROGRESS = "INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)"
+COMPLETE_MODULE = "INSERT OR IGNORE INTO completions VALUES (?, ?, ?, ?)"
+RECORD_QUIZ = "INSERT INTO quiz_history VALUES (?, ?, ?, ?)"
+AWARD_BADGE = "INSERT OR IGNORE INTO badges VALUES (?, ?, ?)"
+
+
+def _sum_deltas(old, new):
+    """Coalesce two queued ADD_SCORE rows for the same user"""
+    return new[0], old[1] + new[1]
+
+
+class Leaderboard:
+    """Positive integer scores counted in a Fenwick tree over score values.
+
+    Updates and rank lookups are O(log max_score); top-k walks down the
+    distinct scores with O(log max_score) per step and is cached until the
+    next update. Users with a score of 0 or less are not ranked.
+    """
+
+    def __init__(self, scores=()):
+        self._scores = {u: s for u, s in scores if s > 0}
+        self._by_score = {}  # score -> set of usernames
+        for username, score in self._scores.items():
+            self._by_score.setdefault(score, set()).add(username)
+        self._rebuild(max(self._by_score, default=0))
+        self._top_cache = {}
+
+    def _rebuild(self, max_score):
+        """Size the tree (a power of two) to hold `max_score` and refill it in O(size)"""
+        size = 1024
+        while size < max_score:
+            size *= 2
+        tree = [0] * (size + 1)
+        for score, usernames in self._by_score.items():
+            tree[score] = len(usernames)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._size, self._tree = size, tree
+
+    def _add(self, score, count):
+        tree, size = self._tree, self._size
+        while score <= size:
+            tree[score] += count
+            score += score & -score
+
+    def _count_at_most(self, score):
+        total = 0
+        while score > 0:
+            total += self._tree[score]
+            score -= score & -score
+        return total
+
+    def _nth_lowest(self, n):
+        """Smallest score s with at least n users scoring <= s"""
+        pos, step = 0, self._size
+        while step:
+            if pos + step <= self._size and self._tree[pos + step] < n:
+                pos += step
+                n -= self._tree[pos]
+            step //= 2
+        return pos + 1
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, username):
+        return self._scores.get(username)
+
+    def update(self, username, score):
+        old = self._scores.pop(username, None)
+        if old is not None:
+            group = self._by_score[old]
+            group.discard(username)
+            if not group:
+                del self._by_score[old]
+            self._add(old, -1)
+        if score > 0:
+            self._by_score.setdefault(score, set()).add(username)
+            if score > self._size:
+                self._rebuild(score)
+            else:
+                self._add(score, 1)
+            self._scores[username] = score
+        self._top_cache.clear()
+
+    def top(self, k=10):
+        """[(username, score)] for the k highest scores, ties by username"""
+        top = self._top_cache.get(k)
+        if top is None:
+            top = []
+            nth = len(self._scores)  # rank from the bottom of the next score to visit
+            while len(top) < k and nth > 0:
+                score = self._nth_lowest(nth)
+                group = self._by_score[score]
+                top.extend((username, score) for username in heapq.nsmallest(k - len(top), group))
+                nth -= len(group)
+            self._top_cache[k] = top
+        return top
+
+    def rank(self, username):
+        """1-based rank (ties share a rank), or None for an unranked user"""
+        score = self._scores.get(username)
+        if score is None:
+            return None
+        return len(self._scores) - self._count_at_most(score) + 1
+
+
+class ProgressStore:
+    """Durable microlearning progress, quiz history, badges and scores in SQLite (WAL mode).
+
+    Writes return immediately: they are queued, coalesced by key (the last
+    write to a user's progress wins, score deltas are summed), and committed
+    in batches by a background thread every `flush_interval` seconds or once
+    `batch_size` writes are pending. A batch that fails is retried up to
+    `max_retries` times; if it still fails it is dropped and the next
+    flush() raises the error. Per-user reads use their own connection and
+    the primary-key/user indexes.
+
+    Scores are stored as increments, so several processes can share one
+    database. Each process keeps a Leaderboard in memory, loaded on first
+    use and then brought up to date every `sync_interval` seconds by reading
+    only the users whose score changed since the last sync.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_interval=0.5, batch_size=256, sync_interval=2.0, max_retries=5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.max_retries = max_retries
+        self._read_db = self._connect()
+        self._read_db.executescript(SCHEMA)
+        columns = {row[1] for row in self._read_db.execute("PRAGMA table_info(users)")}
+        if "version" not in columns:  # databases created before scores were versioned
+            self._read_db.execute("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._read_db.execute("CREATE INDEX IF NOT EXISTS users_by_version ON users (version)")
+        self._read_db.commit()
+        self._read_lock = threading.Lock()
+        self._pending = {}  # coalescing key -> (sql, params, merge)
+        self._appends = []  # (sql, params) rows that are never coalesced
+        self._queued = 0
+        self._written = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._flush_requested = False
+        self._dropped_error = None
+        self._leaderboard = None
+        self._synced_version = 0
+        self._synced_at = 0.0
+        self._leaderboard_lock = threading.Lock()
+        self.last_error = None
+        self._writer = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _merge_pending(self, key, sql, params, merge):
+        """Queue a coalesced write; caller holds self._cond"""
+        queued = self._pending.get(key)
+        if queued is not None and merge is not None:
+            params = merge(queued[1], params)
+        self._pending[key] = (sql, params, merge)
+
+    def _enqueue(self, sql, params, key=None, merge=None):
+        with self._cond:
+            if key is None:
+                self._appends.append((sql, params))
+            else:
+                self._merge_pending(key, sql, params, merge)
+            self._queued += 1
+            if len(self._pending) + len(self._appends) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _requeue(self, pending, appends):
+        """Put a failed batch back in front of anything queued since; caller holds self._cond"""
+        newer, self._pending = self._pending, dict(pending)
+        for key, (sql, params, merge) in newer.items():
+            self._merge_pending(key, sql, params, merge)
+        self._appends = appends + self._appends
+
+    def _run(self):
+        db = self._connect()
+        attempts = 0
+        while True:
+            with self._cond:
+                if attempts or not (self._closing or self._flush_requested
+                                    or len(self._pending) + len(self._appends) >= self.batch_size):
+                    self._cond.wait(self.flush_interval)
+                pending, appends, queued = self._pending, self._appends, self._queued
+                self._pending, self._appends = {}, []
+                self._flush_requested = False
+                closing = self._closing
+            failed = False
+            if pending or appends:
+                batches = {}
+                for sql, params in [entry[:2] for entry in pending.values()] + appends:
+                    batches.setdefault(sql, []).append(params)
+                try:
+                    with db:
+                        for sql, rows in batches.items():
+                            db.executemany(sql, rows)
+                except sqlite3.Error as exc:
+                    self.last_error = exc
+                    attempts += 1
+                    failed = attempts < self.max_retries
+                    if not failed:
+                        self._dropped_error = exc
+            with self._cond:
+                if failed:
+                    self._requeue(pending, appends)
+                else:
+                    attempts = 0
+                    self._written = queued
+                    self._cond.notify_all()
+            if closing and not failed:
+                db.close()
+                return
+
+    def flush(self, timeout=None):
+        """Block until every write queued so far is committed.
+
+        Raises the error of any batch dropped after `max_retries` failures.
+        """
+        with self._cond:
+            target = self._queued
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: self._written >= target, timeout)
+            error, self._dropped_error = self._dropped_error, None
+        if error is not None:
+            raise error
+        return done
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._read_db.close()
+
+    def load_user(self, username):
+        """A user's saved state in microlearning_app's user_data shape"""
+        self.flush()
+        with self._read_lock:
+            db = self._read_db
+            user = db.execute("SELECT score, certificate_name FROM users WHERE username = ?",
+                              (username,)).fetchone()
+            progress = {}
+            for category, modules, last_accessed in db.execute(
+                    "SELECT category, modules, last_accessed FROM progress WHERE username = ?", (username,)):
+                modules = json.loads(modules)
+                progress[category] = {"modules": modules, "completed": {}, "total_modules": len(modules),
+                                      "last_accessed": last_accessed}
+            for category, module, completed_at in db.execute(
+                    "SELECT category, module, completed_at FROM completions WHERE username = ?", (username,)):
+                if category in progress:
+                    progress[category]["completed"][module] = completed_at
+            quiz_history = [{"category": category, "correct": bool(correct)} for category, correct in db.execute(
+                "SELECT category, correct FROM quiz_history WHERE username = ? ORDER BY answered_at", (username,))]
+            badges = [badge for badge, in db.execute(
+                "SELECT badge FROM badges WHERE username = ? ORDER BY awarded_at", (username,))]
+        return {
+            "progress": progress,
+            "quiz_history": quiz_history,
+            "badges": badges,
+            "score": user[0] if user else 0,
+            "last_activity": time.time(),
+            "certificate_name": (user[1] if user else None) or username,
+        }
+
+    def save_progress(self, username, category, modules, last_accessed=None):
+        self._enqueue(SAVE_PROGRESS, (username, category, json.dumps(list(modules)), last_accessed or time.time()),
+                      key=("progress", username, category))
+
+    def complete_module(self, username, category, module, completed_at=None):
+        self._enqueue(COMPLETE_MODULE, (username, category, module, completed_at or time.time()),
+                      key=("completion", username, category, module))
+
+    def record_quiz(self, username, category, correct, answered_at=None):
+        self._enqueue(RECORD_QUIZ, (username, category, int(correct), answered_at or time.time()))
+
+    def award_badge(self, username, badge, awarded_at=None):
+        self._enqueue(AWARD_BADGE, (username, badge, awarded_at or time.time()), key=("badge", username, badge))
+
+    def set_certificate_name(self, username, name):
+        self._enqueue(SET_CERTIFICATE_NAME, (username, name), key=("certificate_name", username))
+
+    def _ensure_leaderboard(self):
+        """The in-memory Leaderboard, loaded or synced with other processes' updates when due"""
+        now = time.monotonic()
+        if self._leaderboard is not None and now - self._synced_at < self.sync_interval:
+            return self._leaderboard
+        self.flush()
+        with self._read_lock:
+            if self._leaderboard is None:
+                # Rows made by set_certificate_name alone have no score yet
+                rows = self._read_db.execute(
+                    "SELECT username, score, version FROM users WHERE score > 0").fetchall()
+            else:
+                rows = self._read_db.execute("SELECT username, score, version FROM users WHERE version > ?",
+                                             (self._synced_version,)).fetchall()
+        if self._leaderboard is None:
+            self._leaderboard = Leaderboard((username, score) for username, score, _ in rows)
+        else:
+            for username, score, _ in rows:
+                self._leaderboard.update(username, score)
+        self._synced_version = max([self._synced_version] + [version for _, _, version in rows])
+        self._synced_at = now
+        return self._leaderboard
+
+    def add_score(self, username, delta):
+        """Add `delta` to a user's score; returns the new score as this process sees it"""
+        with self._leaderboard_lock:
+            leaderboard = self._ensure_leaderboard()
+            score = (leaderboard.score(username) or 0) + delta
+            leaderboard.update(username, score)
+            self._enqueue(ADD_SCORE, (username, delta), key=("score", username), merge=_sum_deltas)
+        return score
+
+    def leaderboard(self, k=10):
+        """[(username, score)] for the top k users"""
+        with self._leaderboard_lock:
+            return self._ensure_leaderboard().top(k)
+
+    def rank(self, username):
+        """(1-based rank, score) for a user, or None before their first score"""
+        with self._leaderboard_lock:
+            leaderboard = self._ensure_leaderboard()
+            rank = leaderboard.rank(username)
+            return None if rank is None else (rank, leaderboard.score(username))
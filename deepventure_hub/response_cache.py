@@ -0,0 +1,204 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Bounded TTL + LRU cache with stale-while-revalidate and an optional SQLite tier.
+
+    An entry younger than `ttl` is fresh. Between `ttl` and `ttl + stale_ttl`
+    it is still returned immediately, but a background refresh is scheduled on
+    `executor` (with no executor it is reloaded like a miss). Older entries
+    are treated as misses and dropped. Values must be JSON
+    serializable when `disk_path` is set.
+
+    The SQLite tier drops expired rows and keeps at most `max_disk_entries`
+    (the most recently stored) on open and every `prune_every` writes.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300, stale_ttl=3600, disk_path=None, executor=None,
+                 max_disk_entries=100_000, prune_every=256):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.prune_every = prune_every
+        self._disk_writes = 0
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.executor = executor
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._refreshing = set()
+        self._refresh_tasks = set()  # keeps async refreshes referenced until done
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "stale_hits": 0, "disk_hits": 0, "misses": 0,
+                          "evictions": 0, "refreshes": 0}
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                             "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_by_age ON responses (stored_at)")
+            with self._lock:
+                self._prune_disk()
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for `key`, calling `loader()` on a miss.
+
+        `loader` may return None to signal a failed load; failures are not
+        cached. Without an executor there is nowhere to refresh in the
+        background, so stale entries are reloaded like misses.
+        """
+        found = self._lookup(key, allow_stale=self.executor is not None)
+        if found is not None:
+            value, stale = found
+            if stale:
+                self._schedule_refresh(key, loader)
+            return value
+        value = loader()
+        if value is not None:
+            self._store(key, value, time.time())
+        return value
+
+    async def get_or_load_async(self, key, loader):
+        """get_or_load for a coroutine function `loader`; stale entries refresh in a task"""
+        found = self._lookup(key)
+        if found is not None:
+            value, stale = found
+            if stale and self._claim_refresh(key):
+                task = asyncio.ensure_future(self._refresh_async(key, loader))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value
+        value = await loader()
+        if value is not None:
+            self._store(key, value, time.time())
+        return value
+
+    def _lookup(self, key, allow_stale=True):
+        """(value, stale) for a usable entry, counting the hit; None (a counted miss) otherwise.
+
+        Expired in-memory entries are dropped, and disk rows are only copied
+        into memory when they are still usable.
+        """
+        now = time.time()
+        max_age = self.ttl + self.stale_ttl if allow_stale else self.ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+        from_disk = False
+        if entry is None:
+            entry = self._disk_get(key)
+            if entry is not None and now - entry[1] < max_age:
+                from_disk = True
+                self._store(key, *entry, persist=False)
+            else:
+                entry = None
+
+        if entry is not None:
+            value, stored_at = entry
+            age = now - stored_at
+            if age < self.ttl:
+                self._count("disk_hits" if from_disk else "hits")
+                return value, False
+            if age < max_age:
+                self._count("stale_hits")
+                return value, True
+
+        self._count("misses")
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _claim_refresh(self, key):
+        """True if the caller should refresh `key` (no refresh already running)"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _schedule_refresh(self, key, loader):
+        if self._claim_refresh(key):
+            self.executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key, loader):
+        try:
+            value = loader()
+            if value is not None:
+                self._store(key, value, time.time())
+                self._count("refreshes")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _refresh_async(self, key, loader):
+        try:
+            value = await loader()
+            if value is not None:
+                self._store(key, value, time.time())
+                self._count("refreshes")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, value, stored_at, persist=True):
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+            if persist and self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                                 (key, json.dumps(value), stored_at))
+                self._disk_writes += 1
+                if self._disk_writes % self.prune_every == 0:
+                    self._prune_disk()
+                self._db.commit()
+
+    def _prune_disk(self):
+        """Delete expired rows, then all but the newest `max_disk_entries`; caller holds the lock"""
+        self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl - self.stale_ttl,))
+        self._db.execute("DELETE FROM responses WHERE key IN "
+                         "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                         (self.max_disk_entries,))
+        self._db.commit()
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT value, stored_at FROM responses WHERE key = ?",
+                                   (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        """Counters plus the current number of in-memory entries"""
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries))
+        lookups = stats["hits"] + stats["stale_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
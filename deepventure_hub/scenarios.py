@@ -0,0 +1,46 @@
+import numpy as np
+
+DEFAULT_SCENARIOS = 10000
+PERCENTILES = (5, 25, 50, 75, 95)
+# Beta concentration around the model's success probability; higher is tighter
+SUCCESS_CONCENTRATION = 50
+
+
+def summarize(samples):
+    """Mean, std, percentiles and a 95% interval for one metric's scenarios"""
+    values = np.percentile(samples, PERCENTILES + (2.5, 97.5))
+    return {
+        "mean": round(float(samples.mean()), 2),
+        "std": round(float(samples.std()), 2),
+        "percentiles": {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+        "ci95": (round(float(values[-2]), 2), round(float(values[-1]), 2)),
+    }
+
+
+def simulate_scenarios(success_prob, ratings, text_lengths, n=DEFAULT_SCENARIOS, seed=None):
+    """Draw `n` scenarios in one vectorized pass and summarize each metric.
+
+    Market potential and risk bootstrap the fetched rows (resampling them with
+    replacement per scenario) using the same formulas as run_simulation; with
+    no rows they fall back to run_simulation's uniform ranges. Success rate
+    is drawn from a Beta distribution centered on the model's prediction.
+    """
+    rng = np.random.default_rng(seed)
+    ratings = np.asarray(ratings, dtype=float)
+    text_lengths = np.asarray(text_lengths, dtype=float)
+    if len(ratings):
+        idx = rng.integers(0, len(ratings), size=(n, len(ratings)))
+        market_potential = np.minimum(text_lengths[idx].mean(axis=1) / 100, 95)
+        risk_factor = 50 - ratings[idx].mean(axis=1) / 2
+    else:
+        market_potential = rng.uniform(60, 95, n)
+        risk_factor = rng.uniform(10, 40, n)
+    p = float(np.clip(success_prob, 1e-3, 1 - 1e-3))
+    success_rate = rng.beta(p * SUCCESS_CONCENTRATION, (1 - p) * SUCCESS_CONCENTRATION, n) * 100
+    return {
+        "scenarios": n,
+        "seed": seed,
+        "success_rate": summarize(success_rate),
+        "market_potential": summarize(market_potential),
+        "risk_factor": summarize(risk_factor),
+    }
@@ -0,0 +1,42 @@
+import atexit
+import threading
+
+import streamlit as st
+from deepventure_backend import DeepVentureBackend
+from metrics import serve_from_env
+
+# Seconds an old backend keeps serving in-flight reruns after a reload
+RELOAD_GRACE_PERIOD = 30
+
+
+@st.cache_resource(show_spinner=False)
+def get_backend(hf_api_token):
+    """One backend per server process (and token), shared by every rerun and session.
+
+    DeepVentureBackend is safe to share across Streamlit script threads: lazy
+    model construction is guarded by a lock and the cache/HTTP pool are
+    thread-safe. The models are warmed up and analytics refreshed on
+    background threads, and the backend is closed when the server process
+    exits.
+    """
+    backend = DeepVentureBackend(hf_api_token)
+    backend.warm_up(background=True)
+    backend.start_analytics_refresher()  # every DEEPVENTURE_ANALYTICS_INTERVAL seconds
+    serve_from_env(backend.metrics)  # /metrics endpoint when DEEPVENTURE_METRICS_PORT is set
+    atexit.register(backend.close)
+    return backend
+
+
+def reload_backend(hf_api_token):
+    """Replace the shared backend for this token; the old one is closed after a grace period.
+
+    Only this token's cache entry is cleared, so backends for other tokens
+    stay cached and in use.
+    """
+    old = get_backend(hf_api_token)
+    get_backend.clear(hf_api_token)
+    timer = threading.Timer(RELOAD_GRACE_PERIOD, old.close)
+    timer.daemon = True
+    timer.start()
+    return get_backend(hf_api_token)
+
@@ -0,0 +1,98 @@
+import numpy as np
+
+LAYER_SIZES = (1, 64, 32, 1)
+# Max absolute difference allowed between SimulationNet and Keras predict on
+# the same weights (both run in float32).
+KERAS_TOLERANCE = 1e-5
+
+
+def _relu(x):
+    return np.maximum(x, 0)
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class SimulationNet:
+    """NumPy forward pass of the 1->64->32->1 (relu, relu, sigmoid) simulation MLP.
+
+    Weights use the Keras `get_weights()` layout: [W1, b1, W2, b2, W3, b3].
+    Integer scores 0-100, which is what evaluate_idea produces, are answered
+    from a precomputed lookup table.
+    """
+
+    def __init__(self, weights):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        grid = np.arange(101, dtype=np.float32).reshape(-1, 1) / 100
+        self.table = self.forward(grid)[:, 0]
+
+    @classmethod
+    def initialize(cls, seed=None):
+        """Fresh weights with Keras Dense defaults: Glorot-uniform kernels, zero biases"""
+        rng = np.random.default_rng(seed)
+        weights = []
+        for fan_in, fan_out in zip(LAYER_SIZES[:-1], LAYER_SIZES[1:]):
+            limit = np.sqrt(6 / (fan_in + fan_out))
+            weights.append(rng.uniform(-limit, limit, size=(fan_in, fan_out)).astype(np.float32))
+            weights.append(np.zeros(fan_out, dtype=np.float32))
+        return cls(weights)
+
+    @classmethod
+    def from_keras(cls, model):
+        return cls(model.get_weights())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls([data[f"arr_{i}"] for i in range(len(data.files))])
+
+    def save(self, path):
+        np.savez(path, *self.weights)
+
+    def forward(self, x):
+        """Batched forward pass over normalized scores of shape (n, 1)"""
+        w1, b1, w2, b2, w3, b3 = self.weights
+        h = _relu(np.asarray(x, dtype=np.float32) @ w1 + b1)
+        h = _relu(h @ w2 + b2)
+        return _sigmoid(h @ w3 + b3)
+
+    def predict(self, scores):
+        """Success probability for each 0-100 score"""
+        scores = np.asarray(scores, dtype=np.float32).ravel()
+        idx = scores.astype(np.int64)
+        exact = (idx == scores) & (idx >= 0) & (idx <= 100)
+        out = np.empty(len(scores), dtype=np.float32)
+        out[exact] = self.table[idx[exact]]
+        if not exact.all():
+            out[~exact] = self.forward(scores[~exact, None] / 100)[:, 0]
+        return out
+
+    def to_keras(self):
+        """Build a compiled Keras model carrying these weights (imports TensorFlow)"""
+        import tensorflow as tf
+
+        model = tf.keras.Sequential([
+            tf.keras.layers.Dense(64, activation='relu', input_shape=(1,)),
+            tf.keras.layers.Dense(32, activation='relu'),
+            tf.keras.layers.Dense(1, activation='sigmoid')
+        ])
+        model.compile(optimizer='adam', loss='mse')
+        model.set_weights(self.weights)
+        return model
+
+
+def max_keras_error(net, model=None):
+    """Largest |NumPy - Keras| over every integer score and a fine grid in between"""
+    if model is None:
+        model = net.to_keras()
+    scores = np.concatenate([np.arange(101), np.linspace(0, 100, 1001)])
+    expected = model.predict(scores.reshape(-1, 1) / 100, batch_size=len(scores), verbose=0)[:, 0]
+    return float(np.max(np.abs(net.predict(scores) - expected)))
+
+
+if __name__ == "__main__":
+    error = max_keras_error(SimulationNet.initialize(seed=0))
+    print(f"max |numpy - keras| = {error:.2e} (tolerance {KERAS_TOLERANCE:.0e})")
+    if error > KERAS_TOLERANCE:
+        raise SystemExit(1)
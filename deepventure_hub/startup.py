@@ -0,0 +1,38 @@
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_import_times = {}
+_component_times = {}
+
+
+def lazy_import(name):
+    """Import `name` on first use, recording how long the first import took"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _import_times.setdefault(name, round(time.perf_counter() - start, 4))
+    return module
+
+
+@contextmanager
+def timed(component):
+    """Record the wall time spent building `component`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _component_times[component] = round(time.perf_counter() - start, 4)
+
+
+def startup_report():
+    """Seconds spent per lazily imported module and per initialized component"""
+    with _lock:
+        return {"imports": dict(_import_times), "components": dict(_component_times)}
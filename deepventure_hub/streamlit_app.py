@@ -1,5 +1,7 @@
 import streamlit as st
-from deepventure_backend import DeepVentureBackend
+from shared_backend import get_backend
+from history import HistoryStore
+from metrics import profile
 import pandas as pd
 import plotly.express as px
 import time
@@ -7,7 +9,6 @@ from datetime import datetime
 
 # Replace with your actual token (kept confidential)
 HF_API_TOKEN = "huggingface_api_token"
-backend = DeepVentureBackend(HF_API_TOKEN)
 
 # Page configuration for a sleek, modern look
 st.set_page_config(
@@ -17,6 +18,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Built once per server process and shared across reruns and sessions
+backend = get_backend(HF_API_TOKEN)
+
 # Custom CSS for advanced UI/UX
 st.markdown("""
 <style>
@@ -83,37 +87,81 @@ h1, h2, h3 {
 </style>
 """, unsafe_allow_html=True)
 
+SIDEBAR_PAGE_SIZE = 5
+
+# Rebuilt only for simulation results not seen before
+@st.cache_data(max_entries=256, show_spinner=False)
+def simulation_figure(success_rate, market_potential, risk_factor):
+    metrics = pd.DataFrame({
+        "Metric": ["Success Rate", "Market Potential", "Risk Factor"],
+        "Value": [success_rate, market_potential, risk_factor]
+    })
+    return px.bar(metrics, x="Metric", y="Value", color="Metric", 
+                  title="Simulation Overview", height=300, 
+                  color_discrete_map={"Success Rate": "#34d399", "Market Potential": "#fbbf24", "Risk Factor": "#f87171"})
+
+def render_vault_entry(record):
+    """Sidebar Markdown for one pitch, rendered once when it is added"""
+    return (
+        f"**Description:** {record.description}\n\n"
+        f"**Score:** {record.score}/100 📊\n"
+        f"**Success Rate:** {record.success_rate}% 🚀\n"
+        f"**Market Potential:** {record.market_potential}% 💰\n"
+        f"**Risk Factor:** {record.risk_factor}% ⚠️\n"
+        f"**Mentor:** {record.mentor} 👩‍🏫\n"
+        f"**Modules:** {', '.join(record.microlearning)} 📚"
+    )
+
 # Initialize session state
 if "history" not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = HistoryStore(render=render_vault_entry)
+if "vault_page" not in st.session_state:
+    st.session_state.vault_page = 0
 
 # Function to evaluate and simulate the idea
-def evaluate_and_simulate(title, description):
+def evaluate_and_simulate(title, description, profile_request=False):
     with st.spinner("🚀 Evaluating your idea..."):
         time.sleep(1)  # Simulate processing delay for UX
-        score = backend.evaluate_idea(description)
-        simulation = backend.run_simulation(title, description, score)
-        mentor = backend.match_mentor(description)
-        microlearning = backend.get_microlearning("business")
+        # The sampling profiler only covers the backend calls, not the UX delay
+        with profile(enabled=profile_request) as profiler:
+            score, simulation = backend.evaluate_and_simulate(title, description)
+            mentor = backend.match_mentor(description)
+            microlearning = backend.get_microlearning("business")
+    if profiler is not None:
+        st.session_state.last_profile = profiler
     
-    result = {
-        "title": title,
-        "description": description,
-        "score": score,
-        "success_rate": simulation["success_rate"],
-        "market_potential": simulation["market_potential"],
-        "risk_factor": simulation["risk_factor"],
-        "mentor": mentor,
-        "microlearning": microlearning
-    }
-    st.session_state.history.append(result)
-    return result
+    record = st.session_state.history.add(title, description, score, simulation, mentor, microlearning)
+    return record._asdict()
+
+@st.fragment
+def idea_vault():
+    # Paging reruns only this fragment, not the whole app
+    history = st.session_state.history
+    if len(history):
+        # Only one page of pre-rendered pitches is drawn per rerun
+        pages = history.page_count(SIDEBAR_PAGE_SIZE)
+        page = min(st.session_state.vault_page, pages - 1)
+        for record in history.page(page, SIDEBAR_PAGE_SIZE):
+            with st.expander(f"Pitch {record.number}: {record.title}"):
+                st.markdown(record.markdown)
+        if pages > 1:
+            newer_col, older_col = st.columns(2)
+            if newer_col.button("◀ Newer", key="vault_newer", disabled=page == 0):
+                st.session_state.vault_page = page - 1
+                st.rerun(scope="fragment")
+            if older_col.button("Older ▶", key="vault_older", disabled=page >= pages - 1):
+                st.session_state.vault_page = page + 1
+                st.rerun(scope="fragment")
+            st.caption(f"Page {page + 1} of {pages}")
+    else:
+        st.info("No pitches yet. Submit an idea to start!")
 
 # Function to clear inputs and reset state
 def clear_inputs():
     st.session_state.title_input = ""
     st.session_state.desc_input = ""
-    st.session_state.history = []
+    st.session_state.history.clear()
+    st.session_state.vault_page = 0
 
 # Main app
 def main():
@@ -123,23 +171,12 @@ def main():
         st.markdown("Empower your ideas with AI insights!")
         st.markdown("---")
         st.subheader("Idea Vault")
-        if st.session_state.history:
-            for i, entry in enumerate(st.session_state.history, 1):
-                with st.expander(f"Pitch {i}: {entry['title']}"):
-                    st.markdown(
-                        f"**Description:** {entry['description']}\n\n"
-                        f"**Score:** {entry['score']}/100 📊\n"
-                        f"**Success Rate:** {entry['success_rate']}% 🚀\n"
-                        f"**Market Potential:** {entry['market_potential']}% 💰\n"
-                        f"**Risk Factor:** {entry['risk_factor']}% ⚠️\n"
-                        f"**Mentor:** {entry['mentor']} 👩‍🏫\n"
-                        f"**Modules:** {', '.join(entry['microlearning'])} 📚"
-                    )
-        else:
-            st.info("No pitches yet. Submit an idea to start!")
+        idea_vault()
         if st.button("Clear All", key="clear_btn"):
             clear_inputs()
             st.rerun()
+        st.markdown("---")
+        profile_request = st.checkbox("🔬 Profile this evaluation", key="profile_toggle")
 
     # Main content
     st.title("DeepVenture Idea Lab ✨")
@@ -156,30 +193,33 @@ def main():
             submit = st.button("Evaluate Now", key="submit_btn")
             
             if submit and title and description:
-                result = evaluate_and_simulate(title, description)
+                result = evaluate_and_simulate(title, description, profile_request)
+                st.session_state.vault_page = 0
                 st.success("✅ Evaluation Complete!")
                 
-                # Display results
-                st.subheader("Your Insights")
-                st.markdown(
-                    f"### 🚀 Evaluation Score: {result['score']}/100\n\n"
-                    f"#### Simulation Results:\n"
-                    f"- **Success Rate:** {result['success_rate']}% 📈\n"
-                    f"- **Market Potential:** {result['market_potential']}% 💰\n"
-                    f"- **Risk Factor:** {result['risk_factor']}% ⚠️\n\n"
-                    f"**Recommended Mentor:** {result['mentor']} 👩‍🏫\n\n"
-                    f"**Suggested Learning Modules:** {', '.join(result['microlearning'])} 📚"
-                )
-                
-                # Visualization
-                metrics = pd.DataFrame({
-                    "Metric": ["Success Rate", "Market Potential", "Risk Factor"],
-                    "Value": [result["success_rate"], result["market_potential"], result["risk_factor"]]
-                })
-                fig = px.bar(metrics, x="Metric", y="Value", color="Metric", 
-                            title="Simulation Overview", height=300, 
-                            color_discrete_map={"Success Rate": "#34d399", "Market Potential": "#fbbf24", "Risk Factor": "#f87171"})
-                st.plotly_chart(fig, use_container_width=True)
+                with backend.metrics.timer("deepventure_ui_render_seconds", app="streamlit"):
+                    # Display results
+                    st.subheader("Your Insights")
+                    st.markdown(
+                        f"### 🚀 Evaluation Score: {result['score']}/100\n\n"
+                        f"#### Simulation Results:\n"
+                        f"- **Success Rate:** {result['success_rate']}% 📈\n"
+                        f"- **Market Potential:** {result['market_potential']}% 💰\n"
+                        f"- **Risk Factor:** {result['risk_factor']}% ⚠️\n\n"
+                        f"**Recommended Mentor:** {result['mentor']} 👩‍🏫\n\n"
+                        f"**Suggested Learning Modules:** {', '.join(result['microlearning'])} 📚"
+                    )
+                    
+                    # Visualization
+                    fig = simulation_figure(result["success_rate"], result["market_potential"], result["risk_factor"])
+                    st.plotly_chart(fig, use_container_width=True)
+
+            if profile_request and "last_profile" in st.session_state:
+                profiler = st.session_state.last_profile
+                with st.expander("🔬 Last evaluation profile"):
+                    st.dataframe(pd.DataFrame(profiler.top(), columns=["Function", "Sample share"]),
+                                 use_container_width=True)
+                    st.code(profiler.collapsed() or "No samples collected", language=None)
 
     with col2:
         # Tips and stats
@@ -191,10 +231,11 @@ def main():
         """)
         
         st.subheader("Your Stats")
-        if st.session_state.history:
-            avg_score = sum(entry["score"] for entry in st.session_state.history) / len(st.session_state.history)
-            st.metric("Average Score", f"{avg_score:.1f}/100")
-            st.metric("Total Pitches", len(st.session_state.history))
+        history = st.session_state.history
+        if history.total:
+            # Running totals, so stats don't rescan the history on every rerun
+            st.metric("Average Score", f"{history.average_score:.1f}/100")
+            st.metric("Total Pitches", history.total)
         else:
             st.info("Submit an idea to see your stats!")
 
@@ -0,0 +1,16 @@
+import json
+
+import pytest
+
+from analytics import AnalyticsRefresher
+
+
+def test_readers_get_a_plain_copy_of_a_frozen_snapshot():
+    refresher = AnalyticsRefresher(lambda: {"market_trends": {"tech": 80.0}, "funding_rounds": 3})
+    snapshot = refresher.latest()
+    data = snapshot.to_dict()
+    assert json.loads(json.dumps(data)) == data
+    data["market_trends"]["tech"] = 0
+    assert snapshot.data["market_trends"]["tech"] == 80.0
+    with pytest.raises(TypeError):
+        snapshot.data["market_trends"]["tech"] = 0
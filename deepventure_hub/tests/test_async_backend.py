@@ -0,0 +1,76 @@
+import asyncio
+
+from async_backend import AsyncDeepVentureBackend
+from response_cache import ResponseCache
+
+ROWS = [{"row": {"stars": 4, "text": "great service"}}]
+
+
+def make_backend(fetch_remote):
+    # A zero TTL keeps every call on the fetch path
+    async_backend = AsyncDeepVentureBackend(hf_api_token="test", cache=ResponseCache(ttl=0, stale_ttl=0))
+    async_backend._fetch_remote = fetch_remote
+    return async_backend
+
+
+def test_waiter_takes_over_when_leader_is_cancelled():
+    calls = []
+
+    async def fetch_remote(query, limit):
+        calls.append((query, limit))
+        await asyncio.sleep(0.1)
+        return ROWS
+
+    async def scenario():
+        async_backend = make_backend(fetch_remote)
+        leader = asyncio.ensure_future(async_backend._fetch_hf_data("A", 10))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(async_backend._fetch_hf_data("A", 10))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        rows = await asyncio.wait_for(waiter, 2)
+        assert leader.cancelled()
+        assert not async_backend._in_flight
+        await async_backend.aclose()
+        return rows
+
+    assert asyncio.run(scenario()) == ROWS
+    assert calls == [("A", 10), ("A", 10)]
+
+
+def test_waiters_share_the_leaders_result():
+    calls = []
+
+    async def fetch_remote(query, limit):
+        calls.append((query, limit))
+        await asyncio.sleep(0.05)
+        return ROWS
+
+    async def scenario():
+        async_backend = make_backend(fetch_remote)
+        results = await asyncio.gather(*(async_backend._fetch_hf_data("A", 10) for _ in range(5)))
+        await async_backend.aclose()
+        return results
+
+    assert asyncio.run(scenario()) == [ROWS] * 5
+    assert calls == [("A", 10)]
+
+
+def test_cancelled_waiter_leaves_the_fetch_running():
+    async def fetch_remote(query, limit):
+        await asyncio.sleep(0.05)
+        return ROWS
+
+    async def scenario():
+        async_backend = make_backend(fetch_remote)
+        leader = asyncio.ensure_future(async_backend._fetch_hf_data("A", 10))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(async_backend._fetch_hf_data("A", 10))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        rows = await leader
+        assert waiter.cancelled()
+        await async_backend.aclose()
+        return rows
+
+    assert asyncio.run(scenario()) == ROWS
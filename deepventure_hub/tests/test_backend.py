@@ -0,0 +1,57 @@
+import pytest
+
+from deepventure_backend import DeepVentureBackend
+
+
+@pytest.fixture
+def backend():
+    backend = DeepVentureBackend("test")
+    yield backend
+    backend.close()
+
+
+def test_run_simulations_rejects_mismatched_lengths(backend):
+    with pytest.raises(ValueError):
+        backend.run_simulations(["A", "B"], ["pizza place", "tech app"], [70])
+
+
+def test_update_online_model_streams_new_rows():
+    from fake_datasets_server import FakeDatasetsServer
+
+    with FakeDatasetsServer(latency=0) as server:
+        backend = DeepVentureBackend("test", api_url=server.url)
+        try:
+            seen = []
+            backend.enable_online_learning().ingest_rows = lambda rows: seen.append([r["row_idx"] for r in rows])
+            backend.update_online_model(query="pizza", limit=3)
+            backend.update_online_model(query="pizza", limit=3)
+        finally:
+            backend.close()
+    assert seen == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_run_simulations_accepts_blank_descriptions(backend):
+    from fake_datasets_server import FakeDatasetsServer
+
+    with FakeDatasetsServer(latency=0) as server:
+        backend.api_url = server.url
+        results = backend.run_simulations(["A", "B"], ["pizza place", "   "], [70, 60])
+    assert len(results) == 2
+
+
+def test_ingested_reviews_merge_into_sampled_analytics():
+    from fake_datasets_server import FakeDatasetsServer
+
+    with FakeDatasetsServer(latency=0) as server:
+        backend = DeepVentureBackend("test", api_url=server.url)
+        try:
+            sampled = backend.get_analytics()
+            backend.ingest_reviews([{"row": {"stars": 1, "text": "cold food at this restaurant"}}])
+            merged = backend.get_analytics()
+        finally:
+            backend.close()
+    assert merged["funding_rounds"] == sampled["funding_rounds"]
+    assert merged["market_trends"]["tech"] == sampled["market_trends"]["tech"]
+    # One 20-point review among the 50 sampled restaurant reviews
+    expected = (sampled["market_trends"]["restaurant"] * 50 + 20) / 51
+    assert merged["market_trends"]["restaurant"] == pytest.approx(expected, abs=0.01)
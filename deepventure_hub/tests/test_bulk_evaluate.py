@@ -0,0 +1,35 @@
+import pytest
+
+import bulk_evaluate
+from deepventure_backend import DeepVentureBackend
+from fake_datasets_server import FakeDatasetsServer
+
+
+@pytest.fixture
+def worker_backend(monkeypatch):
+    with FakeDatasetsServer(latency=0) as server:
+        backend = DeepVentureBackend("test", api_url=server.url)
+        monkeypatch.setattr(bulk_evaluate, "_backend", backend)
+        yield backend
+        backend.close()
+
+
+def test_blank_description_fails_only_its_row(worker_backend):
+    records = bulk_evaluate._evaluate_chunk([(1, "A", "pizza place downtown"), (2, "B", "   "),
+                                             (3, "C", "tech app for dentists")])
+    assert [record["id"] for record in records] == [1, 2, 3]
+    assert [("error" in record) for record in records] == [False, True, False]
+
+
+def test_failing_row_does_not_fail_the_chunk(worker_backend, monkeypatch):
+    evaluate_ideas = worker_backend.evaluate_ideas
+
+    def flaky(descriptions):
+        if "boom" in descriptions:
+            raise RuntimeError("boom")
+        return evaluate_ideas(descriptions)
+
+    monkeypatch.setattr(worker_backend, "evaluate_ideas", flaky)
+    records = bulk_evaluate._evaluate_chunk([(1, "A", "pizza place"), (2, "B", "boom"), (3, "C", "tech app")])
+    assert [("error" in record) for record in records] == [False, True, False]
+    assert records[1]["error"] == "RuntimeError: boom"
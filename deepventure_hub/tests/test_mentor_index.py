@@ -0,0 +1,27 @@
+from mentor_index import MentorIndex
+
+
+def profiles(n, category="tech"):
+    return [{"name": f"mentor{i}", "category": category} for i in range(n)]
+
+
+def test_search_ranks_by_tfidf():
+    index = MentorIndex([{"name": "Chef", "category": "restaurant", "keywords": ["food", "menu"]},
+                         {"name": "Dev", "category": "tech", "keywords": ["app", "cloud"]}])
+    assert [profile["name"] for _, profile, _ in index.search("a cloud app for restaurants", k=2)] == ["Dev", "Chef"]
+    assert index.search("nothing relevant") == []
+
+
+def test_search_best_returns_the_whole_tied_group():
+    index = MentorIndex(profiles(50) + profiles(5, "service"))
+    assert len(index.search("tech startup", k=10)) == 10
+    assert {profile["name"] for _, profile, _ in index.search_best("tech startup")} == \
+        {f"mentor{i}" for i in range(50)}
+
+
+def test_removed_mentor_is_not_returned():
+    index = MentorIndex(profiles(3))
+    index.remove(1)
+    assert [mentor_id for mentor_id, _, _ in index.search_best("technology")] == [0, 2]
+    new_id = index.add({"name": "Late", "category": "tech"})
+    assert new_id in {mentor_id for mentor_id, _, _ in index.search_best("tech")}
@@ -0,0 +1,19 @@
+import json
+
+import numpy as np
+
+import model_store
+from simulation_net import SimulationNet
+
+
+def test_simulation_weights_load_memory_mapped(tmp_path):
+    weights = SimulationNet.initialize(seed=0).weights
+    model_store.save_simulation_weights(str(tmp_path), [w.astype(np.float64) for w in weights])
+    with open(tmp_path / "meta.json", "w") as f:
+        json.dump({"simulation_layers": len(weights)}, f)
+
+    net = model_store.load_simulation_net(str(tmp_path))
+    for loaded, original in zip(net.weights, weights):
+        assert loaded.dtype == np.float32
+        assert isinstance(loaded.base, np.memmap)  # not a private copy
+        np.testing.assert_array_equal(loaded, original)
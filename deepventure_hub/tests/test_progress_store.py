@@ -0,0 +1,72 @@
+import sqlite3
+import time
+
+import pytest
+
+from progress_store import SCHEMA, ProgressStore
+
+
+def test_certificate_name_alone_does_not_join_leaderboard(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path)
+    store.set_certificate_name("renamed", "Ada Lovelace")
+    store.add_score("scorer", 10)
+    store.close()
+
+    # A fresh store loads the leaderboard from SQLite
+    store = ProgressStore(path)
+    try:
+        assert store.leaderboard() == [("scorer", 10)]
+        assert store.rank("renamed") is None
+        assert store.rank("scorer") == (1, 10)
+        assert store.load_user("renamed")["certificate_name"] == "Ada Lovelace"
+    finally:
+        store.close()
+
+
+def test_scores_from_other_processes_are_merged(tmp_path):
+    path = str(tmp_path / "progress.db")
+    first = ProgressStore(path, sync_interval=0)
+    second = ProgressStore(path, sync_interval=0)
+    try:
+        first.add_score("ada", 100)
+        second.add_score("ada", 100)
+        second.add_score("grace", 150)
+        second.flush()
+        assert first.leaderboard() == [("ada", 200), ("grace", 150)]
+        assert first.rank("grace") == (2, 150)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_failed_batch_is_retried(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path, flush_interval=0.05, max_retries=100)
+    other = sqlite3.connect(path)
+    try:
+        other.execute("DROP TABLE badges")
+        other.commit()
+        store.award_badge("ada", "Quiz Master")
+        time.sleep(0.2)
+        other.executescript(SCHEMA)
+        store.flush()
+        assert store.load_user("ada")["badges"] == ["Quiz Master"]
+    finally:
+        other.close()
+        store.close()
+
+
+def test_dropped_batch_is_raised_by_flush(tmp_path):
+    path = str(tmp_path / "progress.db")
+    store = ProgressStore(path, flush_interval=0.01, max_retries=2)
+    other = sqlite3.connect(path)
+    try:
+        other.execute("DROP TABLE badges")
+        other.commit()
+        store.award_badge("ada", "Quiz Master")
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+    finally:
+        other.close()
+        store.close()
@@ -0,0 +1,62 @@
+import sqlite3
+import time
+
+from response_cache import ResponseCache
+
+
+def disk_keys(path):
+    db = sqlite3.connect(path)
+    try:
+        return {key for key, in db.execute("SELECT key FROM responses")}
+    finally:
+        db.close()
+
+
+def test_disk_tier_keeps_newest_rows(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(max_entries=4, disk_path=path, max_disk_entries=3, prune_every=2)
+    for n in range(6):
+        cache.get_or_load(f"q{n}", lambda n=n: [n])
+    cache.close()
+    assert disk_keys(path) == {"q3", "q4", "q5"}
+
+
+def test_expired_rows_are_dropped_on_open(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(ttl=10, stale_ttl=10, disk_path=path)
+    cache._store("old", [1], time.time() - 60)
+    cache._store("new", [2], time.time())
+    cache.close()
+
+    cache = ResponseCache(ttl=10, stale_ttl=10, disk_path=path)
+    cache.close()
+    assert disk_keys(path) == {"new"}
+
+
+def test_expired_disk_row_does_not_evict_live_entries(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(ttl=10, stale_ttl=10, disk_path=path)
+    cache._store("old", [1], time.time() - 60)
+    cache.close()
+
+    cache = ResponseCache(max_entries=1, ttl=10, stale_ttl=10)
+    cache._db = sqlite3.connect(path)  # skip the prune on open
+    cache.get_or_load("live", lambda: [2])
+    assert cache.get_or_load("old", lambda: None) is None
+    assert cache.stats()["evictions"] == 0
+    assert cache.get_or_load("live", lambda: [3]) == [2]
+    cache.close()
+
+
+def test_expired_memory_entries_are_dropped():
+    cache = ResponseCache(ttl=10, stale_ttl=10)
+    cache._store("old", [1], time.time() - 60)
+    assert cache.get_or_load("old", lambda: None) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_stale_entry_reloads_inline_without_executor():
+    cache = ResponseCache(ttl=10, stale_ttl=100)
+    cache._store("key", [1], time.time() - 20)
+    assert cache.get_or_load("key", lambda: [2]) == [2]
+    assert cache.stats()["stale_hits"] == 0
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from simulation_net import KERAS_TOLERANCE, SimulationNet, max_keras_error
+
+
+def test_matches_keras_predict():
+    pytest.importorskip("tensorflow")
+    assert max_keras_error(SimulationNet.initialize(seed=0)) <= KERAS_TOLERANCE
+
+
+def test_lookup_table_matches_forward_pass():
+    net = SimulationNet.initialize(seed=0)
+    scores = np.arange(101)
+    np.testing.assert_allclose(net.predict(scores), net.forward(scores.reshape(-1, 1) / 100)[:, 0], atol=1e-6)